@@ -1,6 +1,11 @@
 import os
+import hashlib
+import stat
+import uuid
+import numpy as np
 import pandas as pd
 from PySide6.QtWidgets import QMessageBox, QStatusBar
+from PySide6.QtCore import QThread, Signal
 
 
 def load_annotations_from_csv(video_path, behaviors, parent=None):
@@ -10,8 +15,8 @@ def load_annotations_from_csv(video_path, behaviors, parent=None):
 
     if os.path.exists(csv_path):
         try:
-            df = pd.read_csv(csv_path)
-            behaviors_in_csv = df.columns.tolist()[1:]
+            # Only the header is needed to check for behavior mismatches
+            behaviors_in_csv = pd.read_csv(csv_path, nrows=0).columns.tolist()[1:]
 
             # Check for behavior mismatches
             template_behaviors = set(behaviors)
@@ -22,24 +27,22 @@ def load_annotations_from_csv(video_path, behaviors, parent=None):
 
             if new_in_template or missing_in_template:
                 # Sync the CSV file with template behaviors
+                df = pd.read_csv(csv_path)
                 synced_df = sync_video_csv_with_template(df, behaviors, csv_path, parent)
                 if synced_df is not None:
-                    df = synced_df
-                    behaviors_in_csv = df.columns.tolist()[1:]
-                    df.to_csv(csv_path, index=False)
+                    behaviors_in_csv = synced_df.columns.tolist()[1:]
+                    synced_df.to_csv(csv_path, index=False)
                 else:
                     # User chose not to sync, return empty annotations
                     return annotations
 
-            # Load annotations
-            for idx, row in df.iterrows():
-                frame = int(row['Frames']) - 1  # 0-based
-                frame_behaviors = []
-                for b in behaviors_in_csv:
-                    if b in behaviors and row[b] == 1: 
-                        frame_behaviors.append(b)
-                if frame_behaviors:
-                    annotations[frame] = frame_behaviors
+            # Load annotations in chunks with explicit dtypes, skipping columns we don't display
+            columns = [b for b in behaviors_in_csv if b in behaviors]
+            dtype = {'Frames': np.int64}
+            dtype.update({b: np.float32 for b in columns})
+            for chunk in pd.read_csv(csv_path, usecols=['Frames'] + columns, dtype=dtype, chunksize=10000):
+                frames = chunk['Frames'].to_numpy() - 1  # 0-based
+                annotations.update(matrix_to_annotations(chunk[columns].to_numpy() == 1, columns, frames))
 
         except Exception as e:
             QMessageBox.warning(parent, "Error", f"Could not load annotations: {str(e)}")
@@ -137,30 +140,78 @@ def save_annotations_to_csv(video_path, annotations, behaviors, status_bar=None)
         return
 
     csv_path = os.path.splitext(video_path)[0] + '.csv'
-
-    # Create data dict
-    data = {'Frames': list(range(1, get_total_frames_from_video(video_path) + 1))}
-    for b in behaviors:
-        data[b] = []
-
-    total_frames = get_total_frames_from_video(video_path)
-    for frame in range(total_frames):
-        active_list = annotations.get(frame, [])
-        for b in behaviors:
-            # Handle both old (single string) and new (list) annotation formats
-            if isinstance(active_list, list):
-                data[b].append(1 if b in active_list else 0)
-            else:
-                data[b].append(1 if b == active_list else 0)
-
-    df = pd.DataFrame(data)
-    df.to_csv(csv_path, index=False)
+    write_annotations_csv(csv_path, annotations, behaviors, get_total_frames_from_video(video_path))
     if status_bar:
         status_bar.showMessage(f"Annotations saved to {csv_path}", 2000)
     else:
         print(f"Annotations saved to {csv_path}")
 
 
+def write_annotations_csv(csv_path, annotations, behaviors, total_frames):
+    """Write annotations to csv_path atomically via a temp file and os.replace"""
+    write_annotation_matrix_csv(csv_path, annotations_to_matrix(annotations, behaviors, total_frames)[:total_frames], behaviors)
+
+
+def write_annotation_matrix_csv(csv_path, matrix, behaviors):
+    """Write a (frames x behaviors) label matrix to csv_path atomically"""
+    # One 0/1 column per behavior, built from the matrix instead of per frame and behavior
+    df = pd.DataFrame(matrix.astype(np.uint8), columns=behaviors)
+    df.insert(0, 'Frames', np.arange(1, len(matrix) + 1))
+    # Write next to the target so os.replace stays on the same filesystem
+    tmp_path = f"{csv_path}.{uuid.uuid4().hex[:8]}.tmp"
+    # 0o666 lets the umask apply, as a plain to_csv would; mkstemp would force 0600
+    os.close(os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+    try:
+        if os.path.exists(csv_path):
+            # Keep the permissions of the file being replaced
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(csv_path).st_mode))
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, csv_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def annotation_matrix_hash(matrix, behaviors):
+    """Return a short digest of a label matrix and its behavior columns"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update('\0'.join(behaviors).encode('utf-8'))
+    digest.update(np.ascontiguousarray(matrix).tobytes())
+    return digest.hexdigest()
+
+
+class AnnotationSaver(QThread):
+    """Background thread for writing an annotation snapshot to CSV"""
+
+    save_finished = Signal(int, str, str, bool)  # revision, csv_path, content hash, skipped
+    save_failed = Signal(int, str, bool)  # revision, error message, explicit
+
+    def __init__(self, video_path, annotations, behaviors, total_frames, revision, skip_if_hash=None, explicit=True):
+        super().__init__()
+        self.csv_path = os.path.splitext(video_path)[0] + '.csv'
+        self.annotations = annotations  # Snapshot, not shared with the UI thread
+        self.behaviors = behaviors
+        self.total_frames = total_frames
+        self.revision = revision
+        self.skip_if_hash = skip_if_hash  # Hash of the last written content; skip the write if unchanged
+        self.explicit = explicit  # Requested by the user rather than by the auto-save timer
+
+    def run(self):
+        """Write the snapshot in the background thread"""
+        try:
+            # Build the label matrix once for both the content hash and the CSV
+            matrix = annotations_to_matrix(self.annotations, self.behaviors, self.total_frames)[:self.total_frames]
+            content_hash = annotation_matrix_hash(matrix, self.behaviors)
+            skipped = content_hash == self.skip_if_hash  # e.g. edits that were undone back to the saved state
+            if not skipped:
+                write_annotation_matrix_csv(self.csv_path, matrix, self.behaviors)
+        except Exception as e:
+            self.save_failed.emit(self.revision, str(e), self.explicit)
+            return
+        self.save_finished.emit(self.revision, self.csv_path, content_hash, skipped)
+
+
 def get_total_frames_from_video(video_path):
     """Get total frames from video file"""
     import cv2
@@ -175,6 +226,91 @@ def get_total_frames_from_video(video_path):
 
 
 
+def annotations_to_matrix(annotations, behaviors, total_frames):
+    """Build a (frames x behaviors) boolean matrix from the frame -> behaviors dict"""
+    column = {b: i for i, b in enumerate(behaviors)}
+    num_frames = max(total_frames, max(annotations, default=-1) + 1)
+    rows, cols = [], []
+    for frame, frame_behaviors in annotations.items():
+        if frame < 0:
+            continue
+        # Handle both old (single string) and new (list) annotation formats
+        if not isinstance(frame_behaviors, list):
+            frame_behaviors = [frame_behaviors]
+        for b in frame_behaviors:
+            if b in column:
+                rows.append(frame)
+                cols.append(column[b])
+
+    matrix = np.zeros((num_frames, len(behaviors)), dtype=bool)
+    matrix[rows, cols] = True
+    return matrix
+
+
+def matrix_to_annotations(matrix, behaviors, frames=None):
+    """Build the frame -> behaviors dict from a (frames x behaviors) boolean matrix"""
+    rows, cols = np.nonzero(matrix)  # Row-major, so behaviors keep column order
+    frame_numbers = rows if frames is None else frames[rows]
+    annotations = {}
+    for frame, col in zip(frame_numbers.tolist(), cols.tolist()):
+        annotations.setdefault(frame, []).append(behaviors[col])
+    return annotations
+
+
+def find_runs(mask):
+    """Return (starts, lengths) of the runs of True values in a 1-D boolean array"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])  # Alternating run starts and ends
+    starts = edges[::2]
+    return starts, edges[1::2] - starts
+
+
+def column_run_stats(matrix):
+    """Return per-column (block_counts, total_frames, max_lengths) of the True runs in a 2-D boolean matrix"""
+    num_columns = matrix.shape[1]
+    padded = np.zeros((matrix.shape[0] + 2, num_columns), dtype=np.int8)
+    padded[1:-1] = matrix
+    edges = np.diff(padded, axis=0).T  # Column-major so each column's starts and ends pair up in order
+    run_columns, run_starts = np.nonzero(edges == 1)
+    run_lengths = np.nonzero(edges == -1)[1] - run_starts
+    max_lengths = np.zeros(num_columns, dtype=np.int64)
+    np.maximum.at(max_lengths, run_columns, run_lengths)
+    block_counts = np.bincount(run_columns, minlength=num_columns)
+    return block_counts, np.count_nonzero(matrix, axis=0), max_lengths
+
+
+def calculate_behavior_statistics(annotations, behaviors, total_frames, frame_rate):
+    """Calculate per-behavior block statistics and overall labeling coverage"""
+    # Calculate behavior statistics from run-length encoded behavior columns
+    matrix = annotations_to_matrix(annotations, behaviors, total_frames)
+    # Each run of consecutive labeled frames is one block; all behaviors are scanned in one pass
+    block_counts, frame_counts, max_lengths = column_run_stats(matrix)
+    behavior_stats = {}
+    for i, behavior in enumerate(behaviors):
+        max_duration = 0
+        if max_lengths[i]:
+            max_duration = int(max_lengths[i]) / frame_rate
+
+        behavior_stats[behavior] = {
+            'block_count': int(block_counts[i]),
+            'total_frames': int(frame_counts[i]),
+            'max_duration': max_duration
+        }
+
+    # Calculate overall labeling statistics
+    total_labeled_frames = int(np.sum(frame_counts))
+    labeled_percentage = (total_labeled_frames / total_frames) * 100 if total_frames > 0 else 0
+    unlabeled_percentage = 100 - labeled_percentage
+
+    labeling_stats = {
+        'total_labeled_frames': total_labeled_frames,
+        'total_frames': total_frames,
+        'labeled_percentage': labeled_percentage,
+        'unlabeled_percentage': unlabeled_percentage
+    }
+    return behavior_stats, labeling_stats
+
+
 def get_default_behaviors():
     """Get default behaviors list"""
     return ["nose-to-nose", "nose-to-body", "anogenital", "passive", "rearing", "fighting"]
@@ -267,7 +403,7 @@ def remove_labels_from_frame(annotations, current_frame, video_player):
         del annotations[current_frame]
 
     # Clear active labels
-    video_player.active_labels = {}
+    video_player.clear_active_labels()
     video_player.is_toggled_active = {}
     video_player.is_stopping_toggle = {}
 
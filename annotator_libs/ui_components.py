@@ -1,9 +1,13 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                              QScrollArea, QGridLayout, QInputDialog, QMessageBox, QGroupBox)
-from PySide6.QtCore import Qt, Signal, QSize, QPropertyAnimation, QEasingCurve, QRect, QTimer
-from PySide6.QtGui import QPainter, QPen, QColor, QFont, QPaintEvent, QPixmap, QImage, QTransform
+                              QScrollArea, QInputDialog, QMessageBox, QGroupBox, QSizePolicy,
+                              QGraphicsDropShadowEffect)
+from PySide6.QtCore import Qt, Signal, QPropertyAnimation, QEasingCurve, QRect, QTimer, QLine
+from PySide6.QtGui import QPainter, QPen, QColor, QFont, QPaintEvent, QPixmap
 import os
 import sys
+import random
+import numpy as np
+from annotator_libs.annotation_logic import annotations_to_matrix, find_runs
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -92,7 +96,6 @@ class BehaviorButtonWidget(QWidget):
 
         # Create button-like container
         self.button = QPushButton()
-        from PySide6.QtWidgets import QSizePolicy
         self.button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.button.setCheckable(True)
         self.button.clicked.connect(self.clicked.emit)
@@ -113,7 +116,6 @@ class BehaviorButtonWidget(QWidget):
             font-size: 13px;
         """)
         # Adding a shadow effect for better readability
-        from PySide6.QtWidgets import QGraphicsDropShadowEffect
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(4)
         shadow.setColor(QColor(0, 0, 0, 180))
@@ -157,6 +159,9 @@ class BehaviorButtons(QWidget):
         super().__init__(parent)
         self.behaviors = []
         self.buttons = []
+        self._checked_buttons = set() # Button widgets whose button is currently checked
+        self._qcolor_cache = {} # Color string -> QColor, shared by behaviors with the same color
+        self._fallback_qcolor = QColor(100, 100, 100) # Shared by every color string that isn't hex
         self.behavior_colors = {
             "nose-to-nose": "#E74C3C",  # Soft Red
             "nose-to-body": "#2ECC71",  # Soft Green
@@ -315,6 +320,7 @@ class BehaviorButtons(QWidget):
     def layout_buttons(self):
         """Layout the behavior buttons in a single column"""
         self.buttons = []
+        self._checked_buttons = set()
 
         # Clear existing widgets safely (excluding the stretch)
         while self.button_layout.count() > 1:
@@ -352,6 +358,7 @@ class BehaviorButtons(QWidget):
             btn_widget.set_button_style(button_style)
 
             btn_widget.clicked.connect(lambda b=behavior: self.toggle_behavior(b))
+            btn_widget.button.toggled.connect(lambda checked, w=btn_widget: self._on_button_checked(w, checked))
             self.button_layout.insertWidget(self.button_layout.count() - 1, btn_widget)
             self.buttons.append(btn_widget)
 
@@ -389,6 +396,18 @@ class BehaviorButtons(QWidget):
         b = min(255, int(color[5:7], 16) + 40)
         return f"#{r:02x}{g:02x}{b:02x}"
 
+    def _on_button_checked(self, btn_widget, checked):
+        """Track which buttons are checked so they can be cleared without scanning all of them"""
+        if checked:
+            self._checked_buttons.add(btn_widget)
+        else:
+            self._checked_buttons.discard(btn_widget)
+
+    def uncheck_all(self):
+        """Uncheck all checked behavior buttons"""
+        for btn_widget in list(self._checked_buttons):
+            btn_widget.button.setChecked(False)
+
     def toggle_behavior(self, behavior):
         """Toggle a behavior label"""
         self.behavior_toggled.emit(behavior)
@@ -404,6 +423,18 @@ class BehaviorButtons(QWidget):
         """Get color for a specific behavior"""
         return self.behavior_colors.get(behavior, "#CCCCCC")
 
+    def get_behavior_qcolor(self, behavior):
+        """Get the color for a specific behavior as a cached QColor"""
+        color_str = self.get_behavior_color(behavior)
+        if not isinstance(color_str, str):
+            return color_str # Already a QColor
+        color = self._qcolor_cache.get(color_str)
+        if color is None:
+            # Only hex strings are supported; anything else is drawn gray
+            color = QColor(color_str) if color_str.startswith('#') else self._fallback_qcolor
+            self._qcolor_cache[color_str] = color
+        return color
+
     def add_behavior(self):
         """Add a new behavior"""
         name, ok = QInputDialog.getText(self, "Add Label", "Enter label name:")
@@ -413,7 +444,6 @@ class BehaviorButtons(QWidget):
                 QMessageBox.warning(self, "Error", "Label already exists")
                 return
             # Assign a random color
-            import random
             color = f"#{random.randint(0, 255):02x}{random.randint(0, 255):02x}{random.randint(0, 255):02x}"
             self.behavior_colors[name] = color
             self.behaviors.append(name)
@@ -469,6 +499,8 @@ class TimelineWidget(QWidget):
         self.scroll_offset = 0  # horizontal scroll position in frames
         self.annotations = {}  # frame -> behavior
         self.behavior_colors = {}  # behavior -> color
+        self._segment_fill_cache = {}  # color string -> translucent QColor fill
+        self._segment_runs = None  # (total_frames, sorted behaviors, behavior -> (starts, lengths)); None when stale
         self.max_tracks = 1
 
         # Set minimum zoom to show all frames, maximum zoom to show 1 frame per pixel
@@ -506,6 +538,7 @@ class TimelineWidget(QWidget):
         """Set annotations and behavior colors for display"""
         self.annotations = annotations
         self.behavior_colors = behavior_colors
+        self._segment_runs = None  # Rebuilt once here rather than on every paint
         self._update_height()
         self.update()
 
@@ -517,11 +550,12 @@ class TimelineWidget(QWidget):
 
     def clear_range_preview(self, behavior=None):
         """Clear the range labeling preview. If behavior is None, clear all."""
+        if not self.preview_behaviors or (behavior is not None and behavior not in self.preview_behaviors):
+            return # Nothing to clear; navigation calls this on every frame
         if behavior is None:
             self.preview_behaviors = {}
         else:
-            if behavior in self.preview_behaviors:
-                del self.preview_behaviors[behavior]
+            del self.preview_behaviors[behavior]
         self._update_height()
         self.update()
 
@@ -564,21 +598,15 @@ class TimelineWidget(QWidget):
         if 0 <= behavior_idx < num_total_behaviors:
             behavior = sorted_behaviors[behavior_idx]
             clicked_frame = self.x_to_frame(x)
-            
-            # Use the same logic as draw_behavior_segments to find the segment
-            behavior_frames = sorted([f for f, behaviors in self.annotations.items() 
-                                     if (isinstance(behaviors, list) and behavior in behaviors) 
-                                     or (not isinstance(behaviors, list) and behaviors == behavior)])
-            
-            if clicked_frame in behavior_frames:
-                # Find start and end of this contiguous segment
-                start = clicked_frame
-                while start - 1 in behavior_frames:
-                    start -= 1
-                end = clicked_frame
-                while end + 1 in behavior_frames:
-                    end += 1
-                return behavior, start, end
+
+            # Use the same runs as draw_behavior_segments to find the segment
+            runs = self._get_segment_runs()[1].get(behavior)
+            if runs is None:
+                return None  # Range preview track without annotations
+            starts, lengths = runs
+            run = np.searchsorted(starts, clicked_frame, side='right') - 1
+            if run >= 0 and clicked_frame < starts[run] + lengths[run]:
+                return behavior, int(starts[run]), int(starts[run] + lengths[run] - 1)
         return None
 
     def mousePressEvent(self, event):
@@ -709,12 +737,13 @@ class TimelineWidget(QWidget):
 
         width = self.width()
         height = self.height()
+        sorted_behaviors = self.get_sorted_behaviors()
 
         # Draw behavior segments
-        self.draw_behavior_segments(painter, width, height)
+        self.draw_behavior_segments(painter, width, height, sorted_behaviors)
 
         # Draw range labeling preview if active
-        self.draw_range_preview(painter, width, height)
+        self.draw_range_preview(painter, width, height, sorted_behaviors)
 
         # Draw timeline axis
         painter.setPen(QPen(QColor(60, 60, 60), 1))
@@ -730,82 +759,89 @@ class TimelineWidget(QWidget):
                 painter.setPen(QPen(QColor(231, 76, 60), 2)) # Red color
                 painter.drawLine(int(x_pos), 0, int(x_pos), height)
 
+    def _get_segment_runs(self):
+        """Get the sorted annotated behaviors and each one's runs of consecutive frames, rebuilding them if stale"""
+        if self._segment_runs is None or self._segment_runs[0] != self.total_frames:
+            annotated_behaviors = set()
+            for behaviors in self.annotations.values():
+                if isinstance(behaviors, list):
+                    annotated_behaviors.update(behaviors)
+                elif behaviors:
+                    annotated_behaviors.add(behaviors)
+            annotated_behaviors = sorted(annotated_behaviors)
+            # One frame x behavior matrix gives every behavior's runs of consecutive frames
+            matrix = annotations_to_matrix(self.annotations, annotated_behaviors, self.total_frames)
+            runs = {behavior: find_runs(matrix[:, idx]) for idx, behavior in enumerate(annotated_behaviors)}
+            self._segment_runs = (self.total_frames, annotated_behaviors, runs)
+        return self._segment_runs[1], self._segment_runs[2]
+
+    def invalidate_segments(self):
+        """Mark the cached segment runs stale after the annotations dict was edited in place"""
+        self._segment_runs = None
+
     def get_sorted_behaviors(self):
         """Get sorted list of all behaviors in annotations and previews"""
-        all_present_behaviors = set()
-        for behaviors in self.annotations.values():
-            if isinstance(behaviors, list):
-                all_present_behaviors.update(behaviors)
-            elif behaviors:
-                all_present_behaviors.add(behaviors)
-        all_present_behaviors.update(self.preview_behaviors.keys())
-        return sorted(list(all_present_behaviors))
-
-    def draw_behavior_segments(self, painter, width, height):
+        annotated_behaviors = self._get_segment_runs()[0]
+        if not self.preview_behaviors:
+            return list(annotated_behaviors)
+        return sorted(set(annotated_behaviors).union(self.preview_behaviors))
+
+    def draw_behavior_segments(self, painter, width, height, sorted_behaviors):
         """Draw colored segments for behavior annotations, supporting multiple tracks"""
-        sorted_behaviors = self.get_sorted_behaviors()
         if not sorted_behaviors:
             return
 
-        # Group consecutive frames for EACH behavior separately
-        behavior_segments = {} # behavior -> list of (start, end)
-        
-        for behavior in sorted_behaviors:
-            segments = []
-            
-            # Find frames that have this behavior, sorted
-            behavior_frames = sorted([f for f, behaviors in self.annotations.items() 
-                                     if (isinstance(behaviors, list) and behavior in behaviors) 
-                                     or behaviors == behavior])
-            
-            if not behavior_frames:
-                continue
-
-            # Group consecutive frames into segments
-            current_start = behavior_frames[0]
-            for i in range(1, len(behavior_frames)):
-                if behavior_frames[i] != behavior_frames[i-1] + 1:
-                    segments.append((current_start, behavior_frames[i-1]))
-                    current_start = behavior_frames[i]
-            segments.append((current_start, behavior_frames[-1]))
-            
-            behavior_segments[behavior] = segments
+        runs = self._get_segment_runs()[1]
 
         # Draw segments
         num_total_behaviors = len(sorted_behaviors)
         track_height = (height - 10) / num_total_behaviors
+        pixels_per_frame = self.get_pixels_per_frame()
+        label_pen = QPen(Qt.black, 1)
         
         for behavior_idx, behavior in enumerate(sorted_behaviors):
-            segments = behavior_segments.get(behavior, [])
-            if not segments:
+            if behavior not in runs:
+                continue  # Range preview track without annotations
+            starts, lengths = runs[behavior]
+            # Only segments that overlap the visible range reach the Python drawing loop
+            start_xs = (starts - self.scroll_offset) * pixels_per_frame
+            end_xs = (starts + lengths - self.scroll_offset) * pixels_per_frame
+            visible = (end_xs > 0) & (start_xs < width)
+            if not visible.any():
                 continue
                 
-            color = self.behavior_colors.get(behavior, "#CCCCCC")
-            q_color = QColor(color)
-            
-            y_pos = 5 + behavior_idx * track_height
-
-            for start, end in segments:
-                start_x = self.frame_to_x(start)
-                end_x = self.frame_to_x(end + 1)
-
-                if end_x > 0 and start_x < width:
-                    visible_start = max(0, start_x)
-                    visible_end = min(width, end_x)
-
-                    if visible_start < visible_end:
-                        painter.fillRect(int(visible_start), int(y_pos), int(visible_end - visible_start), int(track_height),
-                                       QColor(q_color.red(), q_color.green(), q_color.blue(), 150))
-
-                        # Draw behavior label if segment is wide enough
-                        if visible_end - visible_start > 50 and track_height > 15:
-                            rect = QRect(int(visible_start), int(y_pos), int(visible_end - visible_start), int(track_height))
-                            painter.setPen(QPen(Qt.black, 1))
-                            painter.drawText(rect, Qt.AlignCenter, behavior[:3])
-
-    def draw_range_preview(self, painter, width, height):
+            fill_color = self._segment_fill_color(self.behavior_colors.get(behavior, "#CCCCCC"))
+            y_pos = int(5 + behavior_idx * track_height)
+            h = int(track_height)
+            label = behavior[:3]
+
+            # Integer pixel columns, clipped to the widget
+            xs0 = np.maximum(start_xs[visible], 0).astype(np.int64).tolist()
+            xs1 = np.minimum(end_xs[visible], width).astype(np.int64).tolist()
+            labeled = []
+            for x0, x1 in zip(xs0, xs1):
+                if x0 < x1:
+                    painter.fillRect(x0, y_pos, x1 - x0, h, fill_color)
+                    # Draw behavior label if segment is wide enough
+                    if x1 - x0 > 50 and track_height > 15:
+                        labeled.append(QRect(x0, y_pos, x1 - x0, h))
+
+            if labeled:
+                painter.setPen(label_pen)
+                for rect in labeled:
+                    painter.drawText(rect, Qt.AlignCenter, label)
+
+    def _segment_fill_color(self, color):
+        """Get the translucent segment fill for a behavior color, cached per color string"""
+        fill = self._segment_fill_cache.get(color)
+        if fill is None:
+            fill = QColor(color)
+            fill.setAlpha(150)
+            self._segment_fill_cache[color] = fill
+        return fill
+
+    def draw_range_preview(self, painter, width, height, sorted_behaviors):
         """Draw a temporary colored segment for range labeling preview"""
-        sorted_behaviors = self.get_sorted_behaviors()
         if not sorted_behaviors:
             return
 
@@ -860,12 +896,22 @@ class TimelineWidget(QWidget):
         start_frame = max(0, int(self.scroll_offset))
         end_frame = min(self.total_frames, int(self.scroll_offset + width / pixels_per_frame) + 1)
 
+        # Tick positions as integer pixels, drawn in a single batched call
+        ticks = []
         for frame in range(start_frame, end_frame, marker_interval):
             x_pos = self.frame_to_x(frame)
             if 0 <= x_pos <= width:
-                painter.drawLine(int(x_pos), height // 2 - 5, int(x_pos), height // 2 + 5)
-                if pixels_per_frame > 20:  # Only show text if there's space
-                    painter.drawText(int(x_pos) + 2, height // 2 - 8, str(frame))
+                ticks.append((frame, int(x_pos)))
+        if not ticks:
+            return
+
+        y0 = height // 2 - 5
+        y1 = height // 2 + 5
+        painter.drawLines([QLine(x, y0, x, y1) for _, x in ticks])
+        if pixels_per_frame > 20:  # Only show text if there's space
+            text_y = height // 2 - 8
+            for frame, x in ticks:
+                painter.drawText(x + 2, text_y, str(frame))
 
 
 class LoadingScreen(QWidget):
@@ -5,13 +5,52 @@ import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="pkg_resources")
 import pygame
 from pygame.locals import K_ESCAPE
-from PySide6.QtWidgets import QLabel, QProgressBar, QWidget, QHBoxLayout
-from PySide6.QtCore import Qt, QTimer, Signal, QThread, QCoreApplication
+from PySide6.QtWidgets import QLabel, QProgressBar, QWidget, QHBoxLayout, QMessageBox
+from PySide6.QtCore import Qt, QTimer, Signal, QThread, QCoreApplication, QElapsedTimer
 from PySide6.QtGui import QImage, QPixmap, QPainter, QPen, QColor
 import threading
 from collections import OrderedDict
 import time
-from annotator_libs.annotation_logic import update_annotations_on_frame_change # Import the function
+from annotator_libs.annotation_logic import update_annotations_on_frame_change, apply_range_label
+
+
+CONTROLLER_INPUT_EVENTS = (pygame.JOYBUTTONDOWN, pygame.JOYHATMOTION, pygame.JOYAXISMOTION)
+_pygame_events_ready = False # Set once init_pygame_events succeeds; controllers stay off otherwise
+
+
+def init_pygame_events():
+    """Start the pygame event queue once at startup, letting through only controller hot-plug events.
+
+    Returns False if SDL has no usable video driver (e.g. a headless session); the app then runs keyboard-only.
+    """
+    global _pygame_events_ready
+    try:
+        # The event queue needs the display subsystem; mixer, font and the rest are never used
+        pygame.display.init()
+        # Controller state is polled directly, so input events are only queued while something drains them
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed((pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED))
+    except pygame.error as e:
+        print(f"Controller support disabled: {e}")
+        _pygame_events_ready = False
+        return False
+    _pygame_events_ready = True
+    return True
+
+
+def pygame_events_available():
+    """Return whether init_pygame_events set up the event queue controllers rely on"""
+    return _pygame_events_ready
+
+
+def set_controller_input_events(enabled):
+    """Let SDL queue controller button, hat and axis events, or block them again"""
+    if not _pygame_events_ready:
+        return
+    if enabled:
+        pygame.event.set_allowed(CONTROLLER_INPUT_EVENTS)
+    else:
+        pygame.event.set_blocked(CONTROLLER_INPUT_EVENTS)
 
 
 class FrameCache:
@@ -99,7 +138,11 @@ class FramePreloader(QThread):
     def run(self):
         """Preload frames in background thread"""
         preloaded_count = 0
+        emitted_count = 0
         last_read_frame = -1
+        # Progress is reported at most ~60 times per second instead of once per decoded frame
+        progress_timer = QElapsedTimer()
+        progress_timer.start()
         for i in range(self.num_frames_to_preload):
             if not self._is_running:
                 break
@@ -125,13 +168,22 @@ class FramePreloader(QThread):
                         pixmap = QPixmap.fromImage(q_img)
                         self.cache.put(frame_num, pixmap)
                         preloaded_count += 1
-                        self.frame_loaded.emit(preloaded_count, self.num_frames_to_preload, self.total_frames_in_video)
+                        if progress_timer.elapsed() >= 16:
+                            progress_timer.restart()
+                            emitted_count = preloaded_count
+                            self.frame_loaded.emit(preloaded_count, self.num_frames_to_preload, self.total_frames_in_video)
+        if preloaded_count != emitted_count:
+            # Always report the final count
+            self.frame_loaded.emit(preloaded_count, self.num_frames_to_preload, self.total_frames_in_video)
         self.preload_finished.emit() # Emit when preloading is done
 
 
 class VideoPlayer(QLabel):
     """Widget to display video frames and handle navigation"""
 
+    AXIS_PRESS_THRESHOLD = 0.9 # Axis deflection at which an automapped axis counts as pressed
+    AXIS_RELEASE_THRESHOLD = 0.7 # A pressed axis must fall below this to release, so jitter near the press point can't retrigger
+
     frame_changed = Signal(int)
     label_toggled = Signal(str, bool, int, int)  # behavior, is_active, start_frame, end_frame
     current_behavior_changed = Signal(str)
@@ -142,6 +194,7 @@ class VideoPlayer(QLabel):
     caching_complete = Signal() # New signal to indicate caching is complete
     preload_progress = Signal(int, int) # current_preloaded, total_to_preload
     preload_finished = Signal() # Signal emitted when all preloading is complete
+    gamepad_changed = Signal() # Emitted after the gamepad is (re)initialized
 
     def __init__(self, timeline=None):
         super().__init__()
@@ -152,7 +205,9 @@ class VideoPlayer(QLabel):
         self.total_frames = 0
         self.frame_rate = 0
         self.video_path = ""
+        self.annotations = {}  # frame -> behaviors, shared with the main window's dict
         self.active_labels = {}  # behavior -> is_active
+        self._active_label_count = 0  # Number of True entries in active_labels
         self.labeling_mode = False  # This will be managed by the new logic
         self.current_label_behavior = None # This will be managed by the new logic
         self.key_press_start_time = {}  # behavior -> press start time
@@ -307,8 +362,12 @@ class VideoPlayer(QLabel):
         self.init_gamepad()
 
     def init_gamepad(self):
-        """Initialize pygame and joystick"""
-        pygame.init()
+        """Initialize the pygame joystick subsystem; the event queue is set up by init_pygame_events"""
+        if not _pygame_events_ready:
+            # Without the event queue the joystick state never updates, so leave polling off
+            self.joystick = None
+            self.gamepad_changed.emit()
+            return
         pygame.joystick.init()
         if pygame.joystick.get_count() > 0:
             self.joystick = pygame.joystick.Joystick(0)
@@ -319,6 +378,7 @@ class VideoPlayer(QLabel):
         else:
             self.joystick = None
             print("No gamepad detected.")
+        self.gamepad_changed.emit()
 
     def update_input_settings(self, settings):
         """Update input settings from main application"""
@@ -367,7 +427,6 @@ class VideoPlayer(QLabel):
         with self.video_capture_lock:
             self.video_capture = cv2.VideoCapture(video_path)
         if not self.video_capture.isOpened():
-            from PySide6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Error", f"Could not open video: {video_path}")
             return False
 
@@ -376,7 +435,7 @@ class VideoPlayer(QLabel):
         self.frame_rate = self.video_capture.get(cv2.CAP_PROP_FPS)
         self.current_frame = 0
         self.last_read_frame = -1
-        self.active_labels = {}  # Reset active labels
+        self.clear_active_labels()  # Reset active labels
         self.held_behavior = None  # Reset held behavior
         self.current_behavior = None  # Reset current behavior
 
@@ -576,7 +635,7 @@ class VideoPlayer(QLabel):
         prev_color = None
         next_color = None
 
-        if not self.show_overlay_bars or not hasattr(self, 'annotations'):
+        if not self.show_overlay_bars:
             self.prev_bar.setVisible(False)
             self.next_bar.setVisible(False)
             return None, None
@@ -616,7 +675,7 @@ class VideoPlayer(QLabel):
 
     def is_any_behavior_actively_labeled(self):
         """Check if any behavior is currently active or being range-labeled."""
-        is_active_toggle = any(self.active_labels.values())
+        is_active_toggle = self.has_active_labels()
         is_active_range_labeling = any(self.range_labeling_active.values())
         return is_active_toggle or is_active_range_labeling
 
@@ -688,7 +747,7 @@ class VideoPlayer(QLabel):
         target_frame = self.current_frame - step
         if target_frame >= 0:
             # Check if any behavior is active or held (which might cause label removal)
-            has_active = any(self.active_labels.values()) or any(self.label_key_held.values())
+            has_active = self.has_active_labels() or any(self.label_key_held.values())
             if has_active and not self._undo_pushed_for_current_action:
                 self.about_to_change_annotations.emit()
                 self._undo_pushed_for_current_action = True
@@ -699,25 +758,34 @@ class VideoPlayer(QLabel):
     def toggle_label(self, behavior):
         """Toggle a label on/off"""
         self.about_to_change_annotations.emit()
-        if behavior in self.active_labels:
-            self.active_labels[behavior] = not self.active_labels[behavior]
-        else:
-            self.active_labels[behavior] = True
+        self._set_label_active(behavior, not self.active_labels.get(behavior, False))
 
         # For simple toggle, start_frame and end_frame are the current_frame
         self.label_toggled.emit(behavior, self.active_labels[behavior], self.current_frame, self.current_frame)
         self.update_frame_display()
 
+    def _set_label_active(self, behavior, active):
+        """Set a behavior's active state, keeping the active label count in step"""
+        if self.active_labels.get(behavior, False) != active:
+            self._active_label_count += 1 if active else -1
+        self.active_labels[behavior] = active
+
+    def clear_active_labels(self):
+        """Deactivate all labels"""
+        self.active_labels = {}
+        self._active_label_count = 0
+
+    def has_active_labels(self):
+        """Check whether any label is active without scanning active_labels"""
+        return self._active_label_count > 0
+
     def set_labeling_mode(self, behavior, active):
         """Set labeling mode for continuous labeling"""
         self.current_label_behavior = behavior
         self.labeling_mode = active
 
         # Update the active label state for the current behavior
-        if active:
-            self.active_labels[behavior] = True
-        else:
-            self.active_labels[behavior] = False
+        self._set_label_active(behavior, bool(active))
 
         self.update_frame_display()
 
@@ -920,8 +988,7 @@ class VideoPlayer(QLabel):
                     self.scrubbing_timer.start(300) # Reset after 300ms of no movement
 
                     # Check if there are active labels for continuous labeling, removing mode, or held behavior
-                    active_behaviors = [b for b, active in self.active_labels.items() if active]
-                    has_active_labels = len(active_behaviors) > 0
+                    has_active_labels = self.has_active_labels()
                     has_held_behavior = hasattr(self, 'held_behavior') and self.held_behavior is not None
                     needs_frame_by_frame = has_active_labels or self.removing_mode or has_held_behavior
 
@@ -965,7 +1032,7 @@ class VideoPlayer(QLabel):
     def _clear_hold_labels(self, behavior):
         """Clear held behavior and active labels for hold mode after delay"""
         self.held_behavior = None
-        self.active_labels[behavior] = False
+        self._set_label_active(behavior, False)
         # The label_toggled.emit(behavior, False, start_frame, end_frame) is already handled in _handle_label_input
         # when the key is released, so no need to emit again here.
         self.update_frame_display()
@@ -1036,8 +1103,10 @@ class VideoPlayer(QLabel):
                     axis_direction_str = parts[2]
                     if axis_id < self.joystick.get_numaxes():
                         axis_value = self.joystick.get_axis(axis_id)
-                        if axis_direction_str == "Positive": is_pressed = (axis_value > 0.9) # Use threshold
-                        elif axis_direction_str == "Negative": is_pressed = (axis_value < -0.9) # Use threshold
+                        # Hysteresis: stay pressed until the axis clearly returns
+                        threshold = self.AXIS_RELEASE_THRESHOLD if self.gamepad_button_states.get(button_str, False) else self.AXIS_PRESS_THRESHOLD
+                        if axis_direction_str == "Positive": is_pressed = (axis_value > threshold)
+                        elif axis_direction_str == "Negative": is_pressed = (axis_value < -threshold)
             except (ValueError, IndexError, pygame.error) as e:
                 print(f"Error processing automapped button '{button_str}': {e}")
                 continue
@@ -1074,8 +1143,6 @@ class VideoPlayer(QLabel):
         - hold: Press and hold to label range from press to release
         - both: Short press to toggle, long press to label range
         """
-        from annotator_libs.annotation_logic import apply_range_label
-
         if is_pressed:
             self.label_key_held[behavior] = True
 
@@ -1096,7 +1163,6 @@ class VideoPlayer(QLabel):
                     end_frame = self.current_frame
 
                     # Apply the range label to actual annotations (CSV)
-                    from annotator_libs.annotation_logic import apply_range_label
                     apply_range_label(self.annotations, behavior, start_frame, end_frame, self.available_behaviors, 
                                       self.include_last_frame_in_range, self.multitrack_enabled)
 
@@ -1270,7 +1336,6 @@ class VideoPlayer(QLabel):
         self.is_scrubbing = False
         self.update_frame_display()
 
-        from annotator_libs.annotation_logic import apply_range_label
         # Use self.current_frame as the end_frame for applying the label.
         actual_end_frame = self.current_frame
 
@@ -1280,6 +1345,7 @@ class VideoPlayer(QLabel):
                 start_frame = self.range_labeling_start[behavior]
 
                 # Apply the range label to actual annotations (CSV)
+                self.about_to_change_annotations.emit()
                 apply_range_label(self.annotations, behavior, start_frame, actual_end_frame, self.available_behaviors, 
                                   self.include_last_frame_in_range, self.multitrack_enabled)
 
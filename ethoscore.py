@@ -1,12 +1,28 @@
 import sys
 import os
 import time
+import bisect
+import itertools
 import pandas as pd
 import json
+import random
 import warnings
-import cv2
+from types import MappingProxyType
+from urllib.parse import quote, unquote
 import numpy as np
 
+# orjson is optional; settings fall back to the standard library json
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -23,42 +39,106 @@ warnings.filterwarnings("ignore")
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
                               QWidget, QPushButton, QLabel, QFileDialog, QComboBox,
-                              QMessageBox, QInputDialog, QDialog,
+                              QMessageBox, QDialog, QSizePolicy,
                               QFormLayout, QKeySequenceEdit, QDialogButtonBox, QSpinBox,
-                              QGroupBox, QTabWidget, QCheckBox, QSplitter, QListWidget, QListWidgetItem, QMenu, QScrollArea) # Added QCheckBox, QSplitter, QListWidget, QListWidgetItem, QMenu, QScrollArea
-from PySide6.QtCore import Qt, QTimer, QSettings, QCoreApplication, Signal
-from PySide6.QtGui import QKeySequence, QFont, QPainter, QColor, QPen, QBrush
+                              QGroupBox, QTabWidget, QCheckBox, QSplitter, QListWidget, QListWidgetItem, QScrollArea) # Added QCheckBox, QSplitter, QListWidget, QListWidgetItem, QScrollArea
+from PySide6.QtCore import Qt, QTimer, QEvent, QByteArray, QSettings, Signal, QRect, QPointF, QLineF
+from PySide6.QtGui import QKeySequence, QFont, QPainter, QColor, QPen, QBrush, QTransform, QPixmap, QStaticText
 from PySide6.QtSvgWidgets import QSvgWidget
 # Suppress pygame messages
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 import pygame
-from annotator_libs.video_handling import VideoPlayer
+from annotator_libs.video_handling import (VideoPlayer, CONTROLLER_INPUT_EVENTS, init_pygame_events,
+                                           pygame_events_available, set_controller_input_events)
 from annotator_libs.ui_components import (BehaviorButtons, TimelineWidget, LoadingScreen, 
                                         get_friendly_controller_name)
 from annotator_libs.annotation_logic import (
     load_annotations_from_csv,
-    save_annotations_to_csv, update_annotations_on_frame_change,
+    AnnotationSaver, update_annotations_on_frame_change,
     handle_label_state_change, remove_labels_from_frame,
     check_label_removal_on_backward_navigation, handle_behavior_removal,
-    get_default_behaviors
+    get_default_behaviors, calculate_behavior_statistics
 )
 from annotator_libs.gamification_logic import GamificationManager, LiveScoreWidget, GamificationSettingsDialog
 
 # Suppress Qt warnings
 os.environ['QT_LOGGING_RULES'] = '*.warning=false'
 
+# Hat position -> direction name; diagonals resolve to their horizontal component
+_HAT_DIRS = {
+    (1, 0): "Right", (1, 1): "Right", (1, -1): "Right",
+    (-1, 0): "Left", (-1, 1): "Left", (-1, -1): "Left",
+    (0, 1): "Up",
+    (0, -1): "Down",
+}
+# Clears the keypad bit from a combined key int, so keypad keys match their regular shortcuts
+_NON_KEYPAD_MASK = ~Qt.KeypadModifier.value
+VIDEO_EXTENSIONS = frozenset(('.mp4', '.avi', '.mov', '.mkv', '.wmv'))
+# Default shortcuts for the fixed actions, in the order they appear in the settings dialog
+_STATIC_DEFAULT_SHORTCUTS = MappingProxyType({
+    'save': 'Ctrl+S',
+    'load_video': 'Ctrl+O',
+    'load_next_video': 'Ctrl+N',
+    'next_frame': 'Right',
+    'prev_frame': 'Left',
+    'delete': 'Escape',
+    'undo': 'Ctrl+Z',
+})
+# Shortcut keys for toggling behaviors 1-10, bound by default to the digit keys 1-9 then 0
+BEHAVIOR_SHORTCUT_KEYS = tuple(f'toggle_behavior_{i}' for i in range(1, 11))
+BEHAVIOR_SHORTCUT_LABELS = tuple(f'Toggle Behavior {i}' for i in range(1, 11))
+BEHAVIOR_SHORTCUT_DEFAULTS = tuple(str(i % 10) for i in range(1, 11))
+_video_dir_cache = {} # directory -> (mtime, sorted video paths)
+
+def list_video_files(directory):
+    """Return the sorted video paths in directory, cached until the directory changes"""
+    mtime = os.stat(directory).st_mtime
+    cached = _video_dir_cache.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    # DirEntry carries the joined path and file type, so no extra join or stat per entry
+    with os.scandir(directory) as entries:
+        video_files = sorted(entry.path for entry in entries
+                             if os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS and entry.is_file())
+    _video_dir_cache[directory] = (mtime, video_files)
+    return video_files
+
 
 class WelcomeDialog(QDialog):
     """Welcome dialog for selecting video to annotate"""
 
     controllers_rescanned = Signal()  # Signal emitted when controllers are rescanned
+    _svg_cache = {}  # Logo path -> SVG bytes, shared by all dialogs
+
+    @classmethod
+    def _svg_bytes(cls, path):
+        """Return the contents of an SVG file, reading it from disk only once"""
+        data = cls._svg_cache.get(path)
+        if data is None:
+            with open(path, 'rb') as f:
+                data = cls._svg_cache[path] = QByteArray(f.read())
+        return data
+
+    def _set_logo(self, logo_file):
+        """Show logo_file in the logo widget unless it is already shown"""
+        if logo_file == self._current_logo:
+            return
+        self.logo_widget.load(self._svg_bytes(logo_file))
+        self._current_logo = logo_file
 
     def __init__(self, last_video_path="", parent=None):
         super().__init__(parent)
         self.last_video_path = last_video_path
         self.selected_video_path = None
-        # Initialize pygame for controller detection
-        pygame.init()
+        self.controller_count = 0
+        self.controller_name = ""
+        self.setup_ui()
+        # Detect controllers once the dialog is up instead of blocking its first paint
+        QTimer.singleShot(0, self, self._detect_controllers)
+
+    def _detect_controllers(self):
+        """Detect connected controllers and show the matching logo"""
+        # Only the joystick subsystem is needed here, not every pygame module
         pygame.joystick.init()
         self.controller_count = pygame.joystick.get_count()
         self.controller_name = ""
@@ -69,7 +149,9 @@ class WelcomeDialog(QDialog):
                 self.controller_name = joystick.get_name()
             except:
                 self.controller_name = "Controller detected"
-        self.setup_ui()
+
+        # Update logo based on controller count
+        self._set_logo(resource_path("assets/controller-logo.svg") if self.controller_count > 0 else resource_path("assets/keyboard-logo.svg"))
 
     def setup_ui(self):
         self.setWindowTitle("Ethoscore")
@@ -138,9 +220,10 @@ class WelcomeDialog(QDialog):
         # Add stretch to push logo to the right
         top_row.addStretch()
 
-        # Logo - conditionally show controller or keyboard logo (right)
-        logo_file = resource_path("assets/controller-logo.svg") if self.controller_count > 0 else resource_path("assets/keyboard-logo.svg")
-        self.logo_widget = QSvgWidget(logo_file)
+        # Logo - keyboard until a controller is detected (right)
+        self.logo_widget = QSvgWidget()
+        self._current_logo = None
+        self._set_logo(resource_path("assets/keyboard-logo.svg"))
         self.logo_widget.setFixedSize(80, 80)
         top_row.addWidget(self.logo_widget, alignment=Qt.AlignRight)
 
@@ -202,25 +285,19 @@ class WelcomeDialog(QDialog):
             return
 
         current_dir = os.path.dirname(self.last_video_path)
-        video_files = []
-        for f in os.listdir(current_dir):
-            if f.lower().endswith(('.mp4', '.avi', '.mov', '.mkv', '.wmv')):
-                video_files.append(os.path.join(current_dir, f))
-        
-        video_files.sort() # Sort alphabetically
+        video_files = list_video_files(current_dir) # Sorted alphabetically
 
         if not video_files:
             QMessageBox.warning(self, "Error", "No video files found in the current directory.")
             return
 
-        try:
-            current_video_index = video_files.index(self.last_video_path)
-            next_video_index = (current_video_index + 1) % len(video_files)
-            self.selected_video_path = video_files[next_video_index]
-            self.accept()
-        except ValueError:
+        current_video_index = bisect.bisect_left(video_files, self.last_video_path)
+        if current_video_index == len(video_files) or video_files[current_video_index] != self.last_video_path:
             QMessageBox.warning(self, "Error", "Last opened video not found in its directory. Please select a new video.")
             return
+        next_video_index = (current_video_index + 1) % len(video_files)
+        self.selected_video_path = video_files[next_video_index]
+        self.accept()
 
     def select_new_video(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -231,24 +308,26 @@ class WelcomeDialog(QDialog):
             self.selected_video_path = file_path
             self.accept()
 
+    def _controller_count_changed(self):
+        """Check the existing joystick subsystem for added or removed devices"""
+        if not pygame.joystick.get_init():
+            return True
+        try:
+            pygame.event.pump() # Lets SDL process device added/removed events
+        except pygame.error:
+            return True # Event queue unavailable, so the count may be stale
+        return pygame.joystick.get_count() != self.controller_count
+
     def rescan_controllers(self):
         """Rescan for controllers and update the logo and UI"""
+        # Only re-enumerate devices when the controller count actually changed
+        if not self._controller_count_changed():
+            self.controllers_rescanned.emit()
+            return
+
         # Reinitialize pygame joystick
         pygame.joystick.quit()
-        pygame.joystick.init()
-        self.controller_count = pygame.joystick.get_count()
-        self.controller_name = ""
-        if self.controller_count > 0:
-            try:
-                joystick = pygame.joystick.Joystick(0)
-                joystick.init()
-                self.controller_name = joystick.get_name()
-            except:
-                self.controller_name = "Controller detected"
-
-        # Update logo based on new controller count
-        logo_file = resource_path("assets/controller-logo.svg") if self.controller_count > 0 else resource_path("assets/keyboard-logo.svg")
-        self.logo_widget.load(logo_file)
+        self._detect_controllers()
 
         # Emit signal to notify main application that controllers were rescanned
         self.controllers_rescanned.emit()
@@ -259,6 +338,19 @@ class WelcomeDialog(QDialog):
 
 class VideoAnnotator(QMainWindow):
     """Main application window"""
+
+    # Input settings stored in QSettings with their defaults
+    _INPUT_DEFAULTS = (
+        ('frame_step', 1),
+        ('shift_skip', 10),
+        ('deadzone', 10),
+        ('joystick_sensitivity', 5),
+        ('frame_skip', 1),
+        ('fast_forward_multiplier', 10),
+        ('joystick_mode', 'quadratic'),
+    )
+    # Legacy, not used anymore
+    _LEGACY_BUTTON_SETTINGS = {'button_a': 'None', 'button_b': 'None', 'button_x': 'None', 'button_y': 'None'}
     
     def __init__(self):
         super().__init__()
@@ -268,9 +360,25 @@ class VideoAnnotator(QMainWindow):
         self.view_only_mode = False  # Flag to track if in view-only mode
         # Initialize shortcuts first
         self.shortcuts = {}
+        self._key_sequence_cache = {} # Shortcut string -> parsed QKeySequence
         self.undo_stack = [] # Stack for undoing annotations
+        self._annotation_revision = 0 # Bumped on every annotation change
+        self._saved_revision = 0 # Revision last written to disk
+        self._save_thread = None # Background CSV writer
+        self._pending_save = None # Explicit save snapshot queued behind a running save
+        self._saved_content_hash = None # Content hash of the last CSV write, None if unknown
+        self._controls_enabled = None # Last state applied by set_controls_enabled
+        self._last_progress_ui_ts = 0 # Last time the loading screen progress was repainted
+        self._stats_cache = None # (key, behavior_stats, labeling_stats) from the last statistics run
+        self._behavior_colors_cache = None # behavior -> color passed to the timeline, None when stale
         self.settings = QSettings('VideoAnnotator', 'Settings') # Initialize general settings here
         self.input_settings = QSettings('VideoAnnotator', 'InputSettings') # Initialize input settings here
+        # Input settings are flushed to disk once edits settle instead of on every save
+        self._input_settings_sync_timer = QTimer(self)
+        self._input_settings_sync_timer.setSingleShot(True)
+        self._input_settings_sync_timer.setInterval(2000)
+        self._input_settings_sync_timer.timeout.connect(self.input_settings.sync)
+        self._automap_cache = (None, {}) # (stored automappings JSON, parsed mappings)
         self.gamification_settings = QSettings('VideoAnnotator', 'GamificationSettings') # Initialize gamification settings
         self.behavior_settings = QSettings('VideoAnnotator', 'BehaviorSettings') # Initialize behavior settings
         self.load_settings() # Load general settings including auto-save
@@ -366,7 +474,6 @@ class VideoAnnotator(QMainWindow):
 
         # Left panel - video and timeline
         left_widget = QWidget()
-        from PySide6.QtWidgets import QSizePolicy
         left_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         left_panel = QVBoxLayout(left_widget)
         left_panel.setContentsMargins(10, 10, 5, 10)
@@ -378,6 +485,19 @@ class VideoAnnotator(QMainWindow):
         # Pass the timeline widget to the VideoPlayer so it can update the preview
         self.timeline = TimelineWidget()
         self.video_player = VideoPlayer(self.timeline)
+        # The annotations dict is shared by reference; rebind only where self.annotations is replaced (video load, undo)
+        self.video_player.annotations = self.annotations
+
+        # Coalesce bursts of timeline refreshes into at most one per display frame (~16 ms)
+        self._timeline_refresh_timer = QTimer(self)
+        self._timeline_refresh_timer.setSingleShot(True)
+        self._timeline_refresh_timer.setInterval(16)
+        self._timeline_refresh_timer.timeout.connect(self._do_update_timeline_annotations)
+        self._timeline_repaint_timer = QTimer(self)
+        self._timeline_repaint_timer.setSingleShot(True)
+        self._timeline_repaint_timer.setInterval(16)
+        self._timeline_repaint_timer.timeout.connect(self.timeline.update)
+
         self.video_player.frame_changed.connect(self.on_frame_changed)
         self.video_player.label_toggled.connect(self.on_label_state_changed)
         self.video_player.remove_labels.connect(self.remove_labels_from_current_frame)
@@ -421,13 +541,13 @@ class VideoAnnotator(QMainWindow):
         # Timer for gamepad polling
         self.gamepad_timer = QTimer(self)
         self.gamepad_timer.timeout.connect(self.video_player.process_gamepad_input)
-        self.gamepad_timer.start(50) # Poll every 50ms (20 FPS)
+        self.video_player.gamepad_changed.connect(self._update_gamepad_polling)
+        self._update_gamepad_polling()
 
         # Right panel - behavior buttons
         right_widget = QWidget()
         right_widget.setObjectName("rightPanel")
         right_widget.setStyleSheet("QWidget#rightPanel { background-color: #202020; border-left: 1px solid #333; }")
-        from PySide6.QtWidgets import QSizePolicy
         right_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         right_panel = QVBoxLayout(right_widget)
         right_panel.setContentsMargins(10, 10, 10, 10)
@@ -553,9 +673,8 @@ class VideoAnnotator(QMainWindow):
         self.video_player.caching_complete.connect(self.on_caching_complete)
         self.set_controls_enabled(False) # Disable controls initially
 
-        # Loading screen
-        self.loading_screen = LoadingScreen(self)
-        self.loading_screen.hide() # Hide initially
+        # Loading screen, created the first time a video load shows it
+        self.loading_screen = None
         self.video_player.preload_progress.connect(self.update_loading_progress)
         self.video_player.preload_finished.connect(self.on_caching_complete) # Connect to preload_finished
         
@@ -572,6 +691,8 @@ class VideoAnnotator(QMainWindow):
         if self.view_only_mode:
             return
 
+        self._mark_annotations_dirty()
+
         # Deep copy current state
         state = {frame: list(behaviors) for frame, behaviors in self.annotations.items()}
         
@@ -585,6 +706,11 @@ class VideoAnnotator(QMainWindow):
         
         self.undo_stack.append(state)
 
+    def _mark_annotations_dirty(self):
+        """Record that annotations changed since the last save"""
+        self._annotation_revision += 1
+        self.timeline.invalidate_segments() # Edits land in the dict the timeline shares
+
     def undo(self):
         """Undo the last annotation change"""
         if self.view_only_mode:
@@ -598,6 +724,7 @@ class VideoAnnotator(QMainWindow):
         # Restore state
         self.annotations = self.undo_stack.pop()
         self.video_player.annotations = self.annotations
+        self._mark_annotations_dirty()
         
         # Update UI
         self.update_timeline_annotations()
@@ -623,12 +750,14 @@ class VideoAnnotator(QMainWindow):
         load_video_action.triggered.connect(self.load_video_dialog)
         load_next_video_action = file_menu.addAction('Load Next Video')
         load_next_video_action.triggered.connect(self.load_next_video_in_main_ui)
+        self._load_next_video_action = load_next_video_action # Kept for update_menu_shortcuts
         load_behavior_action = file_menu.addAction('Load Behaviors')
         load_behavior_action.triggered.connect(self.load_behavior_dialog)
         file_menu.addSeparator()
         save_action = file_menu.addAction('Save Annotations')
-        save_action.setShortcut(QKeySequence(self.shortcuts.get('save', 'Ctrl+S')))
+        save_action.setShortcut(self._key_sequence(self.shortcuts.get('save', 'Ctrl+S')))
         save_action.triggered.connect(self.save_annotations)
+        self._save_annotations_action = save_action # Kept for set_controls_enabled and update_menu_shortcuts
 
         # Settings menu
         settings_menu = menubar.addMenu('Settings')
@@ -636,6 +765,7 @@ class VideoAnnotator(QMainWindow):
         general_settings_action.triggered.connect(self.show_general_settings_dialog)
         input_settings_action = settings_menu.addAction('Input Settings')
         input_settings_action.triggered.connect(self.show_input_settings_dialog)
+        self._input_settings_action = input_settings_action # Kept for set_controls_enabled
         gamification_settings_action = settings_menu.addAction('Gamification Settings')
         gamification_settings_action.triggered.connect(self.show_gamification_settings_dialog)
         settings_menu.addSeparator()
@@ -655,19 +785,37 @@ class VideoAnnotator(QMainWindow):
         self.show_statistics_popup = self.settings.value('show_statistics_popup', True, bool) # Default enabled
         self.multitrack_enabled = self.settings.value('multitrack_enabled', True, bool) # Default enabled
         self.last_video_path = self.settings.value('last_video_path', '', str)
-        # Load frame positions as JSON string and parse to dict
-        frame_positions_json = self.settings.value('last_frame_positions', '{}', str)
-        try:
-            self.last_frame_positions = json.loads(frame_positions_json)
-        except (json.JSONDecodeError, TypeError):
-            self.last_frame_positions = {}
+        # Load frame positions, stored as one key per video so saving only touches changed videos
+        self.last_frame_positions = {}
+        self._dirty_frame_positions = set() # Videos whose position changed since the last save
+        self.settings.beginGroup('frame_positions')
+        for key in self.settings.childKeys():
+            try:
+                self.last_frame_positions[unquote(key)] = int(self.settings.value(key))
+            except (TypeError, ValueError):
+                pass
+        self.settings.endGroup()
+        # Migrate positions saved by older versions as a single JSON string
+        frame_positions_json = self.settings.value('last_frame_positions', None)
+        if frame_positions_json is not None:
+            try:
+                legacy_positions = _json_loads(frame_positions_json)
+            except (json.JSONDecodeError, TypeError):
+                legacy_positions = {}
+            for path, frame in legacy_positions.items():
+                if path not in self.last_frame_positions:
+                    self.last_frame_positions[path] = frame
+                    self._dirty_frame_positions.add(path)
+            self._write_frame_positions()
+            self.settings.remove('last_frame_positions')
 
         # Load video scores as JSON string and parse to dict
         video_scores_json = self.settings.value('last_video_scores', '{}', str)
         try:
-            self.last_video_scores = json.loads(video_scores_json)
+            self.last_video_scores = _json_loads(video_scores_json)
         except (json.JSONDecodeError, TypeError):
             self.last_video_scores = {}
+        self._saved_general_settings = self._general_settings_values() # Baseline for skipping unchanged writes
 
         # Setup auto-save timer
         self.auto_save_timer = QTimer(self)
@@ -677,19 +825,38 @@ class VideoAnnotator(QMainWindow):
 
     def save_settings(self):
         """Save general application settings"""
-        self.settings.setValue('auto_save_enabled', self.auto_save_enabled)
-        self.settings.setValue('auto_save_interval', self.auto_save_interval)
-        self.settings.setValue('hold_time', self.hold_time)
-        self.settings.setValue('label_key_mode', self.label_key_mode)
-        self.settings.setValue('show_frame_preview_bars', self.show_frame_preview_bars)
-        self.settings.setValue('include_last_frame_in_range', self.include_last_frame_in_range)
-        self.settings.setValue('show_statistics_popup', self.show_statistics_popup)
-        self.settings.setValue('multitrack_enabled', self.multitrack_enabled)
-        self.settings.setValue('last_video_path', self.last_video_path)
-        # Save frame positions as JSON string
-        self.settings.setValue('last_frame_positions', json.dumps(self.last_frame_positions))
-        # Save video scores as JSON string
-        self.settings.setValue('last_video_scores', json.dumps(self.last_video_scores))
+        values = self._general_settings_values()
+        for key, value in values.items():
+            # Only keys whose value differs from the last save are written
+            if self._saved_general_settings.get(key) != value:
+                self.settings.setValue(key, value)
+        self._saved_general_settings = values
+        self._write_frame_positions()
+        self.settings.sync()
+
+    def _general_settings_values(self):
+        """Return the general settings as they are stored in QSettings"""
+        return {
+            'auto_save_enabled': self.auto_save_enabled,
+            'auto_save_interval': self.auto_save_interval,
+            'hold_time': self.hold_time,
+            'label_key_mode': self.label_key_mode,
+            'show_frame_preview_bars': self.show_frame_preview_bars,
+            'include_last_frame_in_range': self.include_last_frame_in_range,
+            'show_statistics_popup': self.show_statistics_popup,
+            'multitrack_enabled': self.multitrack_enabled,
+            'last_video_path': self.last_video_path,
+            'last_video_scores': _json_dumps(self.last_video_scores), # Video scores as JSON string
+        }
+
+    def _write_frame_positions(self):
+        """Write the frame positions that changed since the last save"""
+        self.settings.beginGroup('frame_positions')
+        for path in self._dirty_frame_positions:
+            # Paths contain '/' and '\', which QSettings treats as key separators
+            self.settings.setValue(quote(path, safe=''), self.last_frame_positions[path])
+        self.settings.endGroup()
+        self._dirty_frame_positions.clear()
 
     def load_behavior_settings(self):
         """Load behavior settings from QSettings"""
@@ -720,36 +887,56 @@ class VideoAnnotator(QMainWindow):
         # Use a separate QSettings for shortcuts to avoid conflicts
         self.shortcut_settings = QSettings('VideoAnnotator', 'Shortcuts')
         # Default shortcuts
-        self.shortcuts = {
-            'save': self.shortcut_settings.value('save', 'Ctrl+S'),
-            'load_video': self.shortcut_settings.value('load_video', 'Ctrl+O'),
-            'load_next_video': self.shortcut_settings.value('load_next_video', 'Ctrl+N'), # New shortcut
-            'next_frame': self.shortcut_settings.value('next_frame', 'Right'),
-            'prev_frame': self.shortcut_settings.value('prev_frame', 'Left'),
-            'delete': self.shortcut_settings.value('delete', 'Escape'),
-            'undo': self.shortcut_settings.value('undo', 'Ctrl+Z'),
-        }
+        self.shortcuts = {key: self.shortcut_settings.value(key, default) for key, default in _STATIC_DEFAULT_SHORTCUTS.items()}
         # Add behavior shortcuts 1-10
-        for i in range(1, 11):
-            key = f'toggle_behavior_{i}'
-            default_key = str(i) if i <= 9 else '0'
+        for key, default_key in zip(BEHAVIOR_SHORTCUT_KEYS, BEHAVIOR_SHORTCUT_DEFAULTS):
             self.shortcuts[key] = self.shortcut_settings.value(key, default_key)
+        self._saved_shortcuts = dict(self.shortcuts) # Baseline for skipping unchanged writes
+        self._rebuild_shortcut_dispatch()
 
     def save_shortcuts(self):
         """Save keyboard shortcuts to settings"""
-        for key, value in self.shortcuts.items():
-            self.shortcut_settings.setValue(key, value)
+        changed = {key: value for key, value in self.shortcuts.items() if self._saved_shortcuts.get(key) != value}
+        if changed:
+            for key, value in changed.items():
+                self.shortcut_settings.setValue(key, value)
+            self.shortcut_settings.sync()
+            self._saved_shortcuts = dict(self.shortcuts)
+        self._rebuild_shortcut_dispatch()
+
+    def _rebuild_shortcut_dispatch(self):
+        """Map each shortcut's key combination to its handler so keyPressEvent needs a single lookup"""
+        handlers = [
+            ('save', self.save_annotations),
+            ('load_video', self.load_video_dialog),
+            ('load_next_video', self.load_next_video_in_main_ui),
+            ('next_frame', self._shortcut_next_frame),
+            ('prev_frame', self._shortcut_prev_frame),
+            ('delete', self.remove_labels_from_current_frame),
+            ('undo', self.undo),
+        ]
+        for i, key in enumerate(BEHAVIOR_SHORTCUT_KEYS, 1):
+            handlers.append((key, lambda i=i: self._shortcut_toggle_behavior(i)))
+
+        self._shortcut_dispatch = {}
+        for name, handler in handlers:
+            key_sequence = self._key_sequence(self.shortcuts.get(name) or '')
+            if key_sequence.count() == 0:
+                continue
+            # Earlier entries win when two shortcuts share a key, like the old if/elif order
+            self._shortcut_dispatch.setdefault(key_sequence[0].toCombined(), handler)
+
+    def _key_sequence(self, shortcut):
+        """Return the QKeySequence for a shortcut string, parsing each string only once"""
+        key_sequence = self._key_sequence_cache.get(shortcut)
+        if key_sequence is None:
+            key_sequence = self._key_sequence_cache[shortcut] = QKeySequence(shortcut)
+        return key_sequence
 
     def update_menu_shortcuts(self):
         """Update menu shortcuts based on settings"""
-        menubar = self.menuBar()
-        file_menu = menubar.findChild(QMenu, 'File')
-        if file_menu:
-            for action in file_menu.actions():
-                if action.text() == 'Save Annotations':
-                    action.setShortcut(QKeySequence(self.shortcuts['save']))
-                elif action.text() == 'Load Next Video': # Update shortcut for new action
-                    action.setShortcut(QKeySequence(self.shortcuts['load_next_video']))
+        self._save_annotations_action.setShortcut(self._key_sequence(self.shortcuts['save']))
+        self._load_next_video_action.setShortcut(self._key_sequence(self.shortcuts['load_next_video']))
 
 
 
@@ -803,8 +990,7 @@ class VideoAnnotator(QMainWindow):
 
         # Add behavior shortcuts up to the number of behaviors
         num_behaviors = len(self.behavior_buttons.behaviors)
-        for i in range(1, num_behaviors + 1):
-            shortcut_labels[f'toggle_behavior_{i}'] = f'Toggle Behavior {i}'
+        shortcut_labels.update(zip(BEHAVIOR_SHORTCUT_KEYS[:num_behaviors], BEHAVIOR_SHORTCUT_LABELS))
 
         for key, label in shortcut_labels.items():
             edit = QKeySequenceEdit(QKeySequence(self.shortcuts[key]))
@@ -862,6 +1048,8 @@ class VideoAnnotator(QMainWindow):
 
         # List widget to display current mappings
         self.automap_list = QListWidget()
+        self._automap_items = {} # button name -> (behavior, list item) shown in automap_list
+        self._automap_placeholder = None # "No mappings configured" item while the list is empty
         self.automap_list.setMaximumHeight(150)
         automap_layout.addWidget(self.automap_list)
 
@@ -1033,6 +1221,19 @@ class VideoAnnotator(QMainWindow):
         if dialog.exec() == QDialog.Accepted:
             self.gamification_manager.save_settings(self.gamification_settings)
 
+    def _update_gamepad_polling(self):
+        """Poll the gamepad only while a controller is connected and the window isn't minimized"""
+        if self.video_player.joystick is not None and not self.isMinimized():
+            if not self.gamepad_timer.isActive():
+                self.gamepad_timer.start(50) # Poll every 50ms (20 FPS)
+        else:
+            self.gamepad_timer.stop()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and hasattr(self, 'gamepad_timer'):
+            self._update_gamepad_polling()
+
     def rescan_controllers(self):
         """Rescan for game controllers"""
         # First ensure pygame joystick is reinitialized
@@ -1066,41 +1267,22 @@ class VideoAnnotator(QMainWindow):
         """Load input settings from QSettings at application startup."""
         settings = self.input_settings
 
-        # Load keyboard settings into instance variables
-        self._frame_step = settings.value('frame_step', 1, int)
-        self._shift_skip = settings.value('shift_skip', 10, int)
-
-        # Load controller settings into instance variables
-        self._deadzone = settings.value('deadzone', 10, int)
-        self._joystick_sensitivity = settings.value('joystick_sensitivity', 5, int)
-        self._frame_skip = settings.value('frame_skip', 1, int)
-        self._fast_forward_multiplier = settings.value('fast_forward_multiplier', 10, int)
-        self._joystick_mode = settings.value('joystick_mode', 'quadratic', str)
+        # Load keyboard and controller settings, typed like their defaults
+        self._stored_input_settings = {
+            key: settings.value(key, default, type(default)) for key, default in self._INPUT_DEFAULTS
+        }
 
         # Load controller automappings
         automap_json = settings.value('controller_automappings', '{}', str)
-        try:
-            self.video_player.controller_mappings = json.loads(automap_json)
-        except (json.JSONDecodeError, TypeError):
-            self.video_player.controller_mappings = {}
+        self.video_player.controller_mappings = self._parse_automappings(automap_json)
 
     def get_current_input_settings_for_startup(self):
         """Helper to get current input settings for updating VideoPlayer at startup."""
-        return {
-            'frame_step': getattr(self, '_frame_step', 1),
-            'shift_skip': getattr(self, '_shift_skip', 10),
-            'hold_time': self.hold_time, # Add hold_time here
-            'deadzone': getattr(self, '_deadzone', 10),
-            'joystick_sensitivity': getattr(self, '_joystick_sensitivity', 5),
-            'frame_skip': getattr(self, '_frame_skip', 1),
-            'fast_forward_multiplier': getattr(self, '_fast_forward_multiplier', 10),
-            'joystick_mode': getattr(self, '_joystick_mode', 'quadratic'),
-            'button_a': 'None',  # Legacy, not used anymore
-            'button_b': 'None',
-            'button_x': 'None',
-            'button_y': 'None',
-            'controller_automappings': self.video_player.controller_mappings
-        }
+        input_settings = dict(vars(self).get('_stored_input_settings') or self._INPUT_DEFAULTS)
+        input_settings['hold_time'] = self.hold_time
+        input_settings.update(self._LEGACY_BUTTON_SETTINGS)
+        input_settings['controller_automappings'] = self.video_player.controller_mappings
+        return input_settings
 
     def load_input_settings_into_dialog(self):
         """Load input settings from QSettings into the input settings dialog widgets."""
@@ -1121,60 +1303,57 @@ class VideoAnnotator(QMainWindow):
 
         # Load controller automappings
         automap_json = settings.value('controller_automappings', '{}', str)
-        try:
-            self.video_player.controller_mappings = json.loads(automap_json)
-        except (json.JSONDecodeError, TypeError):
-            self.video_player.controller_mappings = {}
+        self.video_player.controller_mappings = self._parse_automappings(automap_json)
         self.update_automap_display() # Display current mappings
 
     def save_input_settings(self):
         """Save input settings from the dialog widgets to QSettings."""
         settings = self.input_settings
+        # Each widget is read once; the same values are stored and sent to the VideoPlayer
+        input_settings = self.get_current_input_settings()
 
-        # Keyboard settings
-        settings.setValue('frame_step', self.frame_step_spin.value())
-        settings.setValue('shift_skip', self.shift_skip_spin.value())
-
-        # Controller settings
-        settings.setValue('deadzone', self.deadzone_spin.value())
-        settings.setValue('joystick_sensitivity', self.joystick_sensitivity_spin.value())
-        settings.setValue('frame_skip', self.frame_skip_spin.value())
-        settings.setValue('fast_forward_multiplier', self.fast_forward_multiplier_spin.value())
-        settings.setValue('joystick_mode', self.joystick_mode_combo.currentData())
-
-        settings.sync()  # Ensure the settings are written to disk
+        # Keyboard and controller settings; only values that differ from the stored ones are written
+        saved = self._stored_input_settings
+        for key, _ in self._INPUT_DEFAULTS:
+            value = input_settings[key]
+            if saved.get(key) != value:
+                settings.setValue(key, value)
+                saved[key] = value
 
         # Update VideoPlayer with new settings
-        input_settings = {
-            'frame_step': self.frame_step_spin.value(),
-            'shift_skip': self.shift_skip_spin.value(),
-            'deadzone': self.deadzone_spin.value(),
-            'joystick_sensitivity': self.joystick_sensitivity_spin.value(),
-            'frame_skip': self.frame_skip_spin.value(),
-            'fast_forward_multiplier': self.fast_forward_multiplier_spin.value(),
-            'joystick_mode': self.joystick_mode_combo.currentData(),
-            'button_a': 'None',  # Legacy, not used anymore
-            'button_b': 'None',
-            'button_x': 'None',
-            'button_y': 'None',
-            'controller_automappings': self.video_player.controller_mappings # Include automappings
-        }
         self.video_player.update_input_settings(input_settings)
-        self.save_controller_mappings() # Save automappings as well
+        self._write_controller_mappings() # Save automappings as well
+        self._input_settings_sync_timer.start()
         # Update behavior button labels with controller mappings
         self.behavior_buttons.update_button_mappings(self.video_player.controller_mappings)
 
     def save_controller_mappings(self):
         """Save controller automappings to QSettings"""
-        settings = self.input_settings
-        json_mappings = json.dumps(self.video_player.controller_mappings)
-        settings.setValue('controller_automappings', json_mappings)
-        settings.sync()  # Ensure the settings are written to disk
+        self._write_controller_mappings()
+        self._input_settings_sync_timer.start()
+
+    def _write_controller_mappings(self):
+        """Store controller automappings in QSettings without flushing to disk"""
+        json_mappings = _json_dumps(self.video_player.controller_mappings)
+        if json_mappings == self._automap_cache[0]:
+            return # Unchanged since last load or save
+        self.input_settings.setValue('controller_automappings', json_mappings)
+        self._automap_cache = (json_mappings, dict(self.video_player.controller_mappings))
+
+    def _parse_automappings(self, automap_json):
+        """Parse stored automappings JSON, reusing the last result when the string is unchanged"""
+        if automap_json != self._automap_cache[0]:
+            try:
+                parsed = _json_loads(automap_json)
+            except (json.JSONDecodeError, TypeError):
+                parsed = {}
+            self._automap_cache = (automap_json, parsed)
+        return dict(self._automap_cache[1]) # Copy so edits before saving don't touch the cache
 
     def get_current_input_settings(self):
         """Helper to get current input settings from dialog widgets for updating VideoPlayer."""
         # This function is called when the dialog is open, so widgets should exist.
-        return {
+        input_settings = {
             'frame_step': self.frame_step_spin.value(),
             'shift_skip': self.shift_skip_spin.value(),
             'deadzone': self.deadzone_spin.value(),
@@ -1182,24 +1361,38 @@ class VideoAnnotator(QMainWindow):
             'frame_skip': self.frame_skip_spin.value(),
             'fast_forward_multiplier': self.fast_forward_multiplier_spin.value(),
             'joystick_mode': self.joystick_mode_combo.currentData(),
-            'button_a': 'None',  # Legacy, not used anymore
-            'button_b': 'None',
-            'button_x': 'None',
-            'button_y': 'None',
-            'controller_automappings': self.video_player.controller_mappings # Include automappings
         }
+        input_settings.update(self._LEGACY_BUTTON_SETTINGS)
+        input_settings['controller_automappings'] = self.video_player.controller_mappings # Include automappings
+        return input_settings
 
     def update_automap_display(self):
-        """Update the automapping display in the input settings dialog"""
-        self.automap_list.clear()
-        if self.video_player.controller_mappings:
-            for button_name, behavior in self.video_player.controller_mappings.items():
-                friendly_name = get_friendly_controller_name(button_name)
-                item = QListWidgetItem(f"{friendly_name} → {behavior}")
+        """Update the automapping display in the input settings dialog, touching only changed rows"""
+        mappings = self.video_player.controller_mappings
+        items = self._automap_items
+        for button_name in [b for b in items if b not in mappings]:
+            _, item = items.pop(button_name)
+            self.automap_list.takeItem(self.automap_list.row(item))
+
+        for button_name, behavior in mappings.items():
+            shown = items.get(button_name)
+            if shown is not None and shown[0] == behavior:
+                continue
+            text = f"{get_friendly_controller_name(button_name)} → {behavior}"
+            if shown is None:
+                item = QListWidgetItem(text)
                 self.automap_list.addItem(item)
-        else:
-            item = QListWidgetItem("No mappings configured")
-            self.automap_list.addItem(item)
+            else:
+                item = shown[1]
+                item.setText(text)
+            items[button_name] = (behavior, item)
+
+        if mappings and self._automap_placeholder is not None:
+            self.automap_list.takeItem(self.automap_list.row(self._automap_placeholder))
+            self._automap_placeholder = None
+        elif not mappings and self._automap_placeholder is None:
+            self._automap_placeholder = QListWidgetItem("No mappings configured")
+            self.automap_list.addItem(self._automap_placeholder)
 
     def clear_all_automappings(self):
         """Clear all controller automappings"""
@@ -1227,23 +1420,16 @@ class VideoAnnotator(QMainWindow):
 
         # Restore default shortcuts
         if hasattr(self, 'shortcut_edits'):
-            default_shortcuts = {
-                'save': 'Ctrl+S',
-                'load_video': 'Ctrl+O',
-                'load_next_video': 'Ctrl+N',
-                'next_frame': 'Right',
-                'prev_frame': 'Left',
-                'delete': 'Escape',
-                'undo': 'Ctrl+Z',
-            }
-            # Add behavior shortcuts up to the number of behaviors
+            # Fixed shortcuts, then behavior shortcuts up to the number of behaviors
             num_behaviors = len(self.behavior_buttons.behaviors)
-            for i in range(1, num_behaviors + 1):
-                default_shortcuts[f'toggle_behavior_{i}'] = str(i) if i <= 9 else '0'
+            default_shortcuts = itertools.chain(
+                _STATIC_DEFAULT_SHORTCUTS.items(),
+                zip(BEHAVIOR_SHORTCUT_KEYS[:num_behaviors], BEHAVIOR_SHORTCUT_DEFAULTS),
+            )
 
-            for key, shortcut in default_shortcuts.items():
+            for key, shortcut in default_shortcuts:
                 if key in self.shortcut_edits:
-                    self.shortcut_edits[key].setKeySequence(QKeySequence(shortcut))
+                    self.shortcut_edits[key].setKeySequence(self._key_sequence(shortcut))
 
         self.video_player.controller_mappings = {} # Clear automappings
         self.save_controller_mappings() # Save cleared automappings
@@ -1271,6 +1457,7 @@ class VideoAnnotator(QMainWindow):
             }
 
         self.behavior_buttons.load_behaviors(behaviors)
+        self._invalidate_behavior_colors()
         # Connect video player to behavior buttons
         self.video_player.available_behaviors = behaviors
         self.video_player.get_behavior_color = self.behavior_buttons.get_behavior_color
@@ -1279,24 +1466,14 @@ class VideoAnnotator(QMainWindow):
         self.behavior_buttons.update_button_mappings(self.video_player.controller_mappings)
 
         # Update input settings with current settings (to refresh button mappings with new behaviors)
-        try:
-            input_settings = {
-                'frame_step': self.frame_step_spin.value() if hasattr(self, 'frame_step_spin') else 1,
-                'shift_skip': self.shift_skip_spin.value() if hasattr(self, 'shift_skip_spin') else 10,
-                'hold_time': self.hold_time_spin.value() if hasattr(self, 'hold_time_spin') else 500,
-                'deadzone': self.deadzone_spin.value() if hasattr(self, 'deadzone_spin') else 10,
-                'joystick_sensitivity': self.joystick_sensitivity_spin.value() if hasattr(self, 'joystick_sensitivity_spin') else 5,
-                'frame_skip': self.frame_skip_spin.value() if hasattr(self, 'frame_skip_spin') else 1,
-                'button_a': 'None',  # Legacy, not used anymore
-                'button_b': 'None',
-                'button_x': 'None',
-                'button_y': 'None',
-                'controller_automappings': self.video_player.controller_mappings if hasattr(self.video_player, 'controller_mappings') else {}
-            }
-            self.video_player.update_input_settings(input_settings)
-        except AttributeError:
-            # Input settings widgets may not be initialized yet
-            pass
+        # Start from the stored settings and take live widget values only once the dialogs have created them
+        input_settings = self.get_current_input_settings_for_startup()
+        widgets = vars(self)
+        if 'frame_step_spin' in widgets:
+            input_settings.update(self.get_current_input_settings())
+        if 'hold_time_spin' in widgets:
+            input_settings['hold_time'] = self.hold_time_spin.value()
+        self.video_player.update_input_settings(input_settings)
 
     def load_annotations_with_behavior_handling(self, video_path):
         """Load annotations with flexible behavior handling based on CSV content"""
@@ -1307,8 +1484,8 @@ class VideoAnnotator(QMainWindow):
             return {}  # Return empty annotations
 
         try:
-            df = pd.read_csv(csv_path)
-            csv_behaviors = df.columns.tolist()[1:]  # Skip 'Frames' column
+            # Read only the header; the rows are loaded by load_annotations_from_csv
+            csv_behaviors = pd.read_csv(csv_path, nrows=0).columns.tolist()[1:]  # Skip 'Frames' column
             saved_behaviors = self.saved_behaviors if self.saved_behaviors else get_default_behaviors()
 
             # Check if CSV headers match saved behaviors exactly
@@ -1350,6 +1527,7 @@ class VideoAnnotator(QMainWindow):
 
             if msg_box.clickedButton() == fix_csv_btn:
                 # Fix CSV: add new behaviors from saved list with 0s, remove behaviors not in saved list
+                df = pd.read_csv(csv_path)
                 synced_df = self.sync_csv_with_saved_behaviors(df, saved_behaviors)
                 if synced_df is not None:
                     synced_df.to_csv(csv_path, index=False)
@@ -1361,8 +1539,8 @@ class VideoAnnotator(QMainWindow):
                 # Set default colors for new behaviors
                 for behavior in csv_behaviors:
                     if behavior not in self.behavior_buttons.behavior_colors:
-                        import random
                         self.behavior_buttons.behavior_colors[behavior] = f"#{random.randint(0, 255):02x}{random.randint(0, 255):02x}{random.randint(0, 255):02x}"
+                self._invalidate_behavior_colors()
                 self.save_behavior_settings()
                 # Update video player
                 self.video_player.available_behaviors = csv_behaviors
@@ -1377,8 +1555,8 @@ class VideoAnnotator(QMainWindow):
                 # Set default colors for new behaviors
                 for behavior in csv_behaviors:
                     if behavior not in self.behavior_buttons.behavior_colors:
-                        import random
                         self.behavior_buttons.behavior_colors[behavior] = f"#{random.randint(0, 255):02x}{random.randint(0, 255):02x}{random.randint(0, 255):02x}"
+                self._invalidate_behavior_colors()
                 # Update video player but disable controls
                 self.video_player.available_behaviors = csv_behaviors
                 self.video_player.get_behavior_color = self.behavior_buttons.get_behavior_color
@@ -1416,19 +1594,34 @@ class VideoAnnotator(QMainWindow):
         return synced_df
 
     def update_timeline_annotations(self):
+        """Schedule a timeline refresh; repeated calls within one frame are merged"""
+        # Hand over the data now and debounce only the repaint, so a segment click before the refresh
+        # sees the current annotations; undo rebinds self.annotations rather than editing it in place
+        self.timeline.annotations = self.annotations
+        self.timeline.invalidate_segments()
+        if not self._timeline_refresh_timer.isActive():
+            self._timeline_refresh_timer.start()
+
+    def _invalidate_behavior_colors(self):
+        """Rebuild the timeline's behavior colors on the next refresh after behaviors or colors change"""
+        self._behavior_colors_cache = None
+
+    def _do_update_timeline_annotations(self):
         """Update timeline with current annotations and behavior colors"""
-        behavior_colors = {}
-        for behavior in self.behavior_buttons.behaviors:
-            behavior_colors[behavior] = self.behavior_buttons.get_behavior_color(behavior)
+        if self._behavior_colors_cache is None:
+            self._behavior_colors_cache = {
+                behavior: self.behavior_buttons.get_behavior_color(behavior) for behavior in self.behavior_buttons.behaviors
+            }
 
-        self.timeline.set_annotations(self.annotations, behavior_colors)
-        self.timeline.update()
+        self.timeline.set_annotations(self.annotations, self._behavior_colors_cache)
+        self._queue_timeline_repaint()
 
     def load_video_by_path(self, file_path):
         """Load video by path"""
         # Save current frame position and score for the previous video
         if self.video_path:
             self.last_frame_positions[self.video_path] = self.video_player.current_frame
+            self._dirty_frame_positions.add(self.video_path)
             self.last_video_scores[self.video_path] = self.gamification_manager.total_score
 
         # Reset view-only mode for new video
@@ -1449,6 +1642,10 @@ class VideoAnnotator(QMainWindow):
 
             # Try to autoload CSV if exists with flexible behavior handling
             self.annotations = self.load_annotations_with_behavior_handling(file_path)
+            # Freshly loaded annotations match the CSV on disk
+            self._annotation_revision += 1
+            self._saved_revision = self._annotation_revision
+            self._saved_content_hash = None
 
             # Update VideoPlayer with current annotations for overlay preview bars
             self.video_player.annotations = self.annotations
@@ -1466,15 +1663,14 @@ class VideoAnnotator(QMainWindow):
 
             # Go to the determined starting frame
             self.video_player.goto_frame(start_frame)
-            # Force UI update to reflect the new frame
+            # Schedule a repaint for the new frame; it is drawn once control returns to the event loop
             self.video_player.update()
-            QCoreApplication.processEvents()  # Process any pending UI events
             self.on_frame_changed(start_frame)
 
             # Update timeline
             self.timeline.total_frames = self.video_player.total_frames
             self.timeline.current_frame = start_frame # Ensure timeline current frame is set to start_frame
-            self.timeline.update()
+            self._queue_timeline_repaint()
             self.timeline.ensure_marker_visible() # Ensure marker is visible after update
 
             # Update timeline with annotations
@@ -1497,7 +1693,7 @@ class VideoAnnotator(QMainWindow):
 
         if file_path:
             self.load_video_by_path(file_path)
-            self.loading_screen.show() # Show loading screen when video starts loading
+            self._ensure_loading_screen().show() # Show loading screen when video starts loading
             
     def load_next_video_in_main_ui(self):
         """Load the next alphabetical video in the same folder as the currently opened video."""
@@ -1512,35 +1708,24 @@ class VideoAnnotator(QMainWindow):
             dialog.exec()
 
         current_dir = os.path.dirname(self.video_path)
-        video_files = []
-        for f in os.listdir(current_dir):
-            if f.lower().endswith(('.mp4', '.avi', '.mov', '.mkv', '.wmv')):
-                video_files.append(os.path.join(current_dir, f))
-
-        video_files.sort() # Sort alphabetically
+        video_files = list_video_files(current_dir) # Sorted alphabetically, cached until the folder changes
 
         if not video_files:
             QMessageBox.warning(self, "Error", "No video files found in the current directory.")
             return
 
-        try:
-            current_video_index = video_files.index(self.video_path)
-            next_video_index = (current_video_index + 1) % len(video_files)
-            next_video_path = video_files[next_video_index]
-            self.save_annotations() # Save current video annotations before loading the next
-            self.load_video_by_path(next_video_path)
-            self.loading_screen.show() # Show loading screen when video starts loading
-            self.loading_screen.set_loading_text("Loading next video...")
-            self.loading_screen.raise_() # Bring to front
-            QCoreApplication.processEvents() # Process events to ensure loading screen is shown
-        except ValueError:
+        current_video_index = bisect.bisect_left(video_files, self.video_path)
+        if current_video_index == len(video_files) or video_files[current_video_index] != self.video_path:
             QMessageBox.warning(self, "Error", "Current video not found in its directory. Please select a new video.")
             return
+        next_video_index = (current_video_index + 1) % len(video_files)
+        next_video_path = video_files[next_video_index]
+        self.save_annotations() # Save current video annotations before loading the next
+        self.load_video_by_path(next_video_path)
+        self._ensure_loading_screen().show() # Show loading screen when video starts loading
+        self.loading_screen.set_loading_text("Loading next video...")
+        self.loading_screen.raise_() # Bring to front; painted as soon as this handler returns
 
-            self.loading_screen.set_loading_text("Loading video...")
-            self.loading_screen.raise_() # Bring to front
-            QCoreApplication.processEvents() # Process events to ensure loading screen is shown
-                
     def load_behavior_dialog(self):
         """Open dialog to load behavior file"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -1550,29 +1735,38 @@ class VideoAnnotator(QMainWindow):
         
         if file_path:
             try:
-                df = pd.read_csv(file_path)
+                df = pd.read_csv(file_path, nrows=0) # Header only
                 # Get behavior names (skip first column which is 'Frames')
                 behaviors = df.columns.tolist()[1:]
                 self.behavior_buttons.load_behaviors(behaviors)
+                self._invalidate_behavior_colors()
                 # Update video player with new behaviors
                 self.video_player.available_behaviors = behaviors
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Could not load behavior file: {str(e)}")
                 
+    def _queue_timeline_repaint(self):
+        """Repaint the timeline on the next tick, coalescing repeated requests"""
+        if not self._timeline_repaint_timer.isActive():
+            self._timeline_repaint_timer.start()
+
     def on_frame_changed(self, frame_number):
         """Handle frame change events"""
+        # update_frame_display re-emits the current frame after annotation edits and undo; those
+        # repeats still snap the view back to the marker and refresh the overlay's current behaviors
         self.timeline.current_frame = frame_number
         self.timeline.ensure_marker_visible()
-        self.timeline.update()
+        self._queue_timeline_repaint()
 
-        # The video_player.current_behavior updates directly within VideoPlayer.goto_frame but video_player.annotations should be up-to-date for other logic/timeline.
+        # The video_player.current_behavior updates directly within VideoPlayer.goto_frame; video_player.annotations shares this dict (bound in load_video_by_path and undo).
         # The update_annotations_on_frame_change function is still useful for its side effects but its return value for current_behavior is no longer directly assigned here.
         update_annotations_on_frame_change(
             self.annotations, frame_number, self.video_player, self.video_player.available_behaviors
         )
 
-        # Ensure VideoPlayer's annotations are always in sync with the main annotations
-        self.video_player.annotations = self.annotations
+        # Frames are cleared while navigating in removing mode
+        if self.video_player.removing_mode:
+            self._mark_annotations_dirty()
 
 
 
@@ -1598,6 +1792,7 @@ class VideoAnnotator(QMainWindow):
         handle_label_state_change(
             self.annotations, behavior, is_active, current_frame, self.video_player
         )
+        self._mark_annotations_dirty()
 
         # Call gamification manager when a label is applied or deactivated
         if is_active:
@@ -1605,38 +1800,13 @@ class VideoAnnotator(QMainWindow):
         else:
             self.gamification_manager.label_completed(frame_for_gamification, behavior, duration_frames)
 
-        # Ensure VideoPlayer's annotations are always in sync with the main annotations
-        self.video_player.annotations = self.annotations
-
         # Deselect behavior buttons if no behaviors active
-        if not any(self.video_player.active_labels.values()):
-            for btn in self.behavior_buttons.buttons:
-                btn.button.setChecked(False)
+        if not self.video_player.has_active_labels():
+            self.behavior_buttons.uncheck_all()
 
         # Update timeline with new annotations
         self.update_timeline_annotations()
 
-    def _calculate_behavior_segment_duration(self, current_frame, behavior):
-        """Calculate the duration (in frames) of the behavior segment that ends at current_frame"""
-        # Find the start of the current behavior segment by going backwards from current_frame
-        start_frame = current_frame
-        while start_frame > 0:
-            prev_behaviors = self.annotations.get(start_frame - 1, [])
-            if isinstance(prev_behaviors, list):
-                if behavior in prev_behaviors:
-                    start_frame -= 1
-                else:
-                    break
-            else:
-                if prev_behaviors == behavior:
-                    start_frame -= 1
-                else:
-                    break
-
-        # Calculate duration (inclusive of start and end frames)
-        duration_frames = current_frame - start_frame + 1
-        return duration_frames
-
     def on_behavior_toggled(self, behavior):
         """Handle behavior toggle from button"""
         if self.view_only_mode:
@@ -1652,6 +1822,7 @@ class VideoAnnotator(QMainWindow):
         # Update video player with new behaviors
         self.video_player.available_behaviors = self.behavior_buttons.behaviors
         # Update timeline colors
+        self._invalidate_behavior_colors()
         self.update_timeline_annotations()
         # Re-apply controller mappings
         self.behavior_buttons.update_button_mappings(self.video_player.controller_mappings)
@@ -1666,6 +1837,7 @@ class VideoAnnotator(QMainWindow):
         # Remove from annotations if present
         handle_behavior_removal(self.annotations, behavior, self.behavior_buttons.behaviors)
         # Update timeline
+        self._invalidate_behavior_colors()
         self.update_timeline_annotations()
 
     def on_segment_clicked(self, behavior, start, end, clicked_frame, red_line_frame, button):
@@ -1755,9 +1927,8 @@ class VideoAnnotator(QMainWindow):
         # Call gamification manager for each removed label
         for frame, behavior in removed_labels:
             self.gamification_manager.label_removed(frame, behavior)
-
-        # Ensure VideoPlayer's annotations are always in sync with the main annotations
-        self.video_player.annotations = self.annotations
+        if removed_labels:
+            self._mark_annotations_dirty()
 
         # Update timeline
         self.update_timeline_annotations()
@@ -1785,115 +1956,158 @@ class VideoAnnotator(QMainWindow):
             else:
                 self.gamification_manager.label_removed(current_frame, removed_behaviors)
 
-        # Ensure VideoPlayer's annotations are always in sync with the main annotations
-        self.video_player.annotations = self.annotations
-
         # Update timeline
         self.update_timeline_annotations()
 
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts"""
-        # Build key sequence string from modifiers and key
-        modifier_str = ""
-        if event.modifiers() & Qt.ControlModifier:
-            modifier_str += "Ctrl+"
-        if event.modifiers() & Qt.ShiftModifier:
-            modifier_str += "Shift+"
-        if event.modifiers() & Qt.AltModifier:
-            modifier_str += "Alt+"
-        if event.modifiers() & Qt.MetaModifier:
-            modifier_str += "Meta+"
-        key_str = QKeySequence(event.key()).toString()
-        key_sequence = modifier_str + key_str
+        # Key plus modifiers as one int; keypad keys match their regular shortcuts
+        key_combination = event.keyCombination().toCombined() & _NON_KEYPAD_MASK
 
         # Check custom shortcuts
-        if key_sequence == self.shortcuts['save']:
-            self.save_annotations()
-            return
-        elif key_sequence == self.shortcuts['load_video']:
-            self.load_video_dialog()
-            return
-        elif key_sequence == self.shortcuts['load_next_video']: # Handle new shortcut
-            self.load_next_video_in_main_ui()
-            return
-        elif key_sequence == self.shortcuts['next_frame']:
-            if self.video_player.total_frames > 0:
-                next_frame = min(self.video_player.current_frame + 1, self.video_player.total_frames - 1)
-                self.video_player.goto_frame(next_frame)
-            return
-        elif key_sequence == self.shortcuts['prev_frame']:
-            if self.video_player.total_frames > 0:
-                prev_frame = max(self.video_player.current_frame - 1, 0)
-                self.video_player.goto_frame(prev_frame)
-            return
-        elif key_sequence == self.shortcuts['delete']:
-            if self.view_only_mode:
-                QMessageBox.information(self, "Preview Only Mode", "Cannot modify annotations in view-only mode.")
-                return
-            self.remove_labels_from_current_frame()
-            return
-        elif key_sequence == self.shortcuts['undo']:
-            self.undo()
+        handler = self._shortcut_dispatch.get(key_combination)
+        if handler is not None and handler() is not False:
             return
-        # Check behavior shortcuts 1-10
-        for i in range(1, 11):
-            if key_sequence == self.shortcuts[f'toggle_behavior_{i}'] and len(self.behavior_buttons.behaviors) >= i:
-                if self.view_only_mode:
-                    QMessageBox.information(self, "Preview Only Mode", "Cannot modify annotations in view-only mode.")
-                    return
-                self.behavior_buttons.toggle_behavior(self.behavior_buttons.behaviors[i-1])
-                return
 
         super().keyPressEvent(event)
 
+    def _shortcut_next_frame(self):
+        """Step one frame forward from a keyboard shortcut"""
+        if self.video_player.total_frames > 0:
+            next_frame = min(self.video_player.current_frame + 1, self.video_player.total_frames - 1)
+            self.video_player.goto_frame(next_frame)
+
+    def _shortcut_prev_frame(self):
+        """Step one frame back from a keyboard shortcut"""
+        if self.video_player.total_frames > 0:
+            prev_frame = max(self.video_player.current_frame - 1, 0)
+            self.video_player.goto_frame(prev_frame)
+
+    def _shortcut_toggle_behavior(self, i):
+        """Toggle the i-th behavior (1-based); returns False if there is no such behavior"""
+        if len(self.behavior_buttons.behaviors) < i:
+            return False
+        if self.view_only_mode:
+            QMessageBox.information(self, "Preview Only Mode", "Cannot modify annotations in view-only mode.")
+            return
+        self.behavior_buttons.toggle_behavior(self.behavior_buttons.behaviors[i-1])
+
     def save_annotations(self):
         """Save annotations to CSV file in video2_2.csv format"""
         if self.view_only_mode:
             QMessageBox.information(self, "Preview Only Mode", "Cannot save annotations in view-only mode.")
             return
-        save_annotations_to_csv(self.video_path, self.annotations, self.behavior_buttons.behaviors, self.statusBar())
+        if not self.video_path:
+            self.statusBar().showMessage("Error: No video loaded. Cannot save annotations.", 3000)
+            return
+        if self._save_thread is not None and self._save_thread.isRunning():
+            # Queue behind the running save so an older snapshot can't land on top of this one
+            self._pending_save = self._snapshot_annotations()
+            self.statusBar().showMessage("Saving annotations...", 2000)
+            return
+        self._start_background_save("Saving annotations...")
 
     def auto_save_annotations(self):
-        """Automatically save annotations"""
+        """Automatically save annotations in a background thread if they changed"""
         if self.view_only_mode:
             return  # Don't auto-save in view-only mode
-        if self.video_path: # Only auto-save if a video is loaded
-            self.statusBar().showMessage("Auto-saving annotations...", 2000) # Show message for 2 seconds
-            self.save_annotations()
+        if not self.video_path: # Only auto-save if a video is loaded
+            return
+        if self._annotation_revision == self._saved_revision:
+            return  # Nothing changed since the last save
+        if self._save_thread is not None and self._save_thread.isRunning():
+            return  # Previous save is still writing
+        # Edits that cancel out still bump the revision, so let the writer compare content too
+        self._start_background_save("Auto-saving annotations...", skip_if_hash=self._saved_content_hash, explicit=False)
+
+    def _snapshot_annotations(self):
+        """Capture everything a background save needs, so the UI can keep editing while it writes"""
+        annotations = {frame: list(behaviors) if isinstance(behaviors, list) else behaviors
+                       for frame, behaviors in self.annotations.items()}
+        return (self.video_path, annotations, list(self.behavior_buttons.behaviors),
+                self.video_player.total_frames, self._annotation_revision)
+
+    def _start_background_save(self, message, skip_if_hash=None, explicit=True, snapshot=None):
+        """Write a snapshot of the annotations to CSV in a background thread"""
+        if snapshot is None:
+            snapshot = self._snapshot_annotations()
+        self._save_thread = AnnotationSaver(*snapshot, skip_if_hash, explicit)
+        self._save_thread.save_finished.connect(self.on_save_finished)
+        self._save_thread.save_failed.connect(self.on_save_failed)
+        self.statusBar().showMessage(message, 2000) # Show message for 2 seconds
+        self._save_thread.start()
+
+    def _start_pending_save(self):
+        """Start the explicit save that was queued behind the save that just completed"""
+        if self._pending_save is None:
+            return
+        snapshot, self._pending_save = self._pending_save, None
+        # The result signal is the last thing run() does, so this only waits for the thread to return
+        self._save_thread.wait()
+        self._start_background_save("Saving annotations...", snapshot=snapshot)
+
+    def on_save_finished(self, revision, csv_path, content_hash, skipped):
+        """Handle a completed background save"""
+        self._start_pending_save()
+        # Ignore stale results, e.g. a save that finished after a newer one was started
+        if revision > self._saved_revision:
+            self._saved_revision = revision
+            self._saved_content_hash = content_hash
+        if skipped:
+            return  # Nothing was written
+        self.statusBar().showMessage(f"Annotations saved to {csv_path}", 2000)
+
+    def on_save_failed(self, revision, error, explicit):
+        """Handle a failed background save"""
+        self._start_pending_save()
+        if not explicit:
+            # A lasting failure retries on every auto-save tick, so don't block the UI with a dialog each time
+            self.statusBar().showMessage(f"Auto-save failed: {error}", 5000)
+            return
+        QMessageBox.warning(self, "Error", f"Could not save annotations: {error}")
 
     def set_controls_enabled(self, enabled):
         """Enable or disable interactive controls"""
+        if enabled == self._controls_enabled:
+            return # caching_complete and preload_finished both report the same state
+        self._controls_enabled = enabled
         self.behavior_buttons.setEnabled(enabled)
         self.timeline.setEnabled(enabled)
         self.save_btn.setEnabled(enabled)
         # Disable menu actions that interact with video/annotations
-        for action in self.menuBar().actions():
-            if action.text() == 'File':
-                for sub_action in action.menu().actions():
-                    if sub_action.text() in ['Save Annotations']:
-                        sub_action.setEnabled(enabled)
-            # Also disable input settings if no video is loaded, as they affect video player
-            if action.text() == 'Settings':
-                for sub_action in action.menu().actions():
-                    if sub_action.text() in ['Input Settings']:
-                        sub_action.setEnabled(enabled)
+        self._save_annotations_action.setEnabled(enabled)
+        # Also disable input settings if no video is loaded, as they affect video player
+        self._input_settings_action.setEnabled(enabled)
+
+    def _ensure_loading_screen(self):
+        """Return the loading screen, creating it on first use"""
+        if self.loading_screen is None:
+            self.loading_screen = LoadingScreen(self)
+            self.loading_screen.hide()
+        return self.loading_screen
 
     def update_loading_progress(self, current, total):
         """Update the loading screen progress"""
-        if self.loading_screen.isVisible():
+        if self.loading_screen is not None and self.loading_screen.isVisible():
+            # Repaint at most ~30 times per second; always show the final count
+            now = time.monotonic()
+            if current != total and now - self._last_progress_ui_ts < 0.033:
+                return
+            self._last_progress_ui_ts = now
             progress = 0.0
             if total > 0:
                 progress = current / total
             self.loading_screen.set_animation_progress(progress)
+            # Both setters schedule a repaint; the preloader runs in its own thread, so the event loop is free to paint
             self.loading_screen.set_loading_text(f"Caching frames: {current}/{total}")
-            QCoreApplication.processEvents() # Ensure UI updates
 
     def on_caching_complete(self):
         """Handle caching complete event from VideoPlayer"""
         self.statusBar().showMessage("Cached & ready", 500)
         self.set_controls_enabled(True)
         self.video_player.setFocus() # Ensure video player has focus for immediate key input
-        self.loading_screen.hide() # Hide loading screen
+        if self.loading_screen is not None:
+            self.loading_screen.hide() # Hide loading screen
 
     def closeEvent(self, event):
         """Handle application close event to save settings."""
@@ -1901,6 +2115,17 @@ class VideoAnnotator(QMainWindow):
             self.last_video_scores[self.video_path] = self.gamification_manager.total_score
         self.save_settings() # Save general settings
         self.gamification_manager.save_settings(self.gamification_settings) # Save gamification settings
+        # Flush input settings still waiting on the debounce timer
+        if self._input_settings_sync_timer.isActive():
+            self._input_settings_sync_timer.stop()
+            self.input_settings.sync()
+        # Let a running save and any save queued behind it finish writing before the app exits
+        if self._save_thread is not None and self._save_thread.isRunning():
+            self._save_thread.wait()
+        if self._pending_save is not None:
+            snapshot, self._pending_save = self._pending_save, None
+            self._start_background_save("Saving annotations...", snapshot=snapshot)
+            self._save_thread.wait()
         super().closeEvent(event)
 
     def resizeEvent(self, event):
@@ -1939,55 +2164,14 @@ class VideoAnnotator(QMainWindow):
         else:
             statistics['annotation_speed'] = 0
 
-        # Calculate behavior statistics
-        behavior_stats = {}
-        for behavior in self.behavior_buttons.behaviors:
-            # Count occurrences (blocks) and find max duration
-            block_count = 0
-            total_frames = 0
-            max_duration = 0
-
-            # Get only frames that have this behavior, sorted
-            relevant_frames = sorted([f for f, behaviors in self.annotations.items() 
-                                     if (isinstance(behaviors, list) and behavior in behaviors) 
-                                     or behaviors == behavior])
-
-            if relevant_frames:
-                total_frames = len(relevant_frames)
-                block_count = 1
-                current_start = relevant_frames[0]
-                
-                for i in range(1, len(relevant_frames)):
-                    if relevant_frames[i] != relevant_frames[i-1] + 1:
-                        # Gap detected, end previous block
-                        duration = (relevant_frames[i-1] - current_start + 1) / self.video_player.frame_rate
-                        max_duration = max(max_duration, duration)
-                        # Start new block
-                        current_start = relevant_frames[i]
-                        block_count += 1
-                
-                # Handle the last block
-                duration = (relevant_frames[-1] - current_start + 1) / self.video_player.frame_rate
-                max_duration = max(max_duration, duration)
-
-            behavior_stats[behavior] = {
-                'block_count': block_count,
-                'total_frames': total_frames,
-                'max_duration': max_duration
-            }
-
-        # Calculate overall labeling statistics
-        total_labeled_frames = sum(stats['total_frames'] for stats in behavior_stats.values())
-        total_frames = self.video_player.total_frames
-        labeled_percentage = (total_labeled_frames / total_frames) * 100 if total_frames > 0 else 0
-        unlabeled_percentage = 100 - labeled_percentage
-
-        statistics['labeling_stats'] = {
-            'total_labeled_frames': total_labeled_frames,
-            'total_frames': total_frames,
-            'labeled_percentage': labeled_percentage,
-            'unlabeled_percentage': unlabeled_percentage
-        }
+        # Behavior statistics only change when annotations, behaviors or the video change
+        behaviors = self.behavior_buttons.behaviors
+        cache_key = (self._annotation_revision, tuple(behaviors),
+                     self.video_player.total_frames, self.video_player.frame_rate)
+        if self._stats_cache is None or self._stats_cache[0] != cache_key:
+            self._stats_cache = (cache_key,) + calculate_behavior_statistics(
+                self.annotations, behaviors, self.video_player.total_frames, self.video_player.frame_rate)
+        _, behavior_stats, statistics['labeling_stats'] = self._stats_cache
 
         statistics['behaviors'] = behavior_stats
         return statistics
@@ -2003,6 +2187,7 @@ def main():
     program_start_time = time.time()
 
     app = QApplication(sys.argv)
+    init_pygame_events() # Process-wide SDL event state, set once before any controller code runs; keyboard-only if it fails
     window = VideoAnnotator()
     window.program_start_time = program_start_time
     window.video_player.program_start_time = program_start_time
@@ -2024,6 +2209,9 @@ def main():
 
 class ControllerAutomapDialog(QDialog):
     """Dialog for controller automapping"""
+
+    AXIS_ACTIVATION_THRESHOLD = 0.5 # Axis travel from its baseline that counts as a deliberate input
+    POLL_INTERVAL_MS = 15 # Event-queue drain interval while listening
     def __init__(self, behaviors, current_mappings, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Controller Automapping")
@@ -2031,10 +2219,18 @@ class ControllerAutomapDialog(QDialog):
         # Filter out fast_backward if it exists, fast_forward is used for both directions
         self.behaviors = [b for b in behaviors if b != "fast_backward"]
         self.current_mappings = current_mappings.copy() # Make a mutable copy
+        self._behavior_to_button = {} # Reverse index of current_mappings: behavior -> button name
+        for button_name, behavior in self.current_mappings.items():
+            self._behavior_to_button.setdefault(behavior, button_name)
         self.listening_for_input = False
         self.target_behavior = None
         self.joystick = None
-        self.baseline_axis_values = {} # Store initial axis values when listening starts
+        self._num_axes = 0 # Axis count of self.joystick, queried once
+        self._instance_id = None # Instance id of self.joystick; events from other controllers are ignored
+        self._button_names = () # Precomputed mapping names of self.joystick's inputs
+        self._axis_names = ()
+        self._hat_names = {}
+        self.baseline_axis_values = [] # Initial value of each axis when listening starts, indexed by axis
 
         self.setup_ui()
         self.init_pygame_joystick()
@@ -2050,6 +2246,13 @@ class ControllerAutomapDialog(QDialog):
 
         self.populate_behavior_list()
 
+        # Non-modal feedback line, so confirming a mapping doesn't open a nested event loop
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        self._status_clear_timer = QTimer(self)
+        self._status_clear_timer.setSingleShot(True)
+        self._status_clear_timer.timeout.connect(self.status_label.clear)
+
         buttons = QDialogButtonBox(
             QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.RestoreDefaults,
             Qt.Horizontal, self
@@ -2061,10 +2264,14 @@ class ControllerAutomapDialog(QDialog):
 
         self.gamepad_timer = QTimer(self)
         self.gamepad_timer.timeout.connect(self.poll_gamepad_for_mapping)
-        self.listen_delay_timer = None # Initialize delay timer
+        # Short delay between clicking Listen and polling, created once and restarted per listen
+        self.listen_delay_timer = QTimer(self)
+        self.listen_delay_timer.setSingleShot(True)
+        self.listen_delay_timer.timeout.connect(self._start_polling_after_delay)
 
     def populate_behavior_list(self):
         self.list_widget.clear()
+        self._mapped_labels = {} # behavior -> "Mapped to" label of its row
         for behavior in self.behaviors:
             item_widget = QWidget()
             item_layout = QHBoxLayout(item_widget)
@@ -2076,6 +2283,7 @@ class ControllerAutomapDialog(QDialog):
             mapped_button_label = QLabel(self.get_mapped_button_name(behavior))
             mapped_button_label.setObjectName(f"mapped_label_{behavior}") # Unique object name for easy access
             item_layout.addWidget(mapped_button_label)
+            self._mapped_labels[behavior] = mapped_button_label
 
             listen_button = QPushButton("Listen")
             listen_button.clicked.connect(lambda checked, b=behavior: self.start_listening(b))
@@ -2090,27 +2298,65 @@ class ControllerAutomapDialog(QDialog):
 
     def get_mapped_button_name(self, behavior):
         """Returns the human-readable name of the button mapped to a behavior."""
-        for button_name, mapped_behavior in self.current_mappings.items():
-            if mapped_behavior == behavior:
-                friendly_name = get_friendly_controller_name(button_name)
-                return f"Mapped to: {friendly_name}"
-        return "Not mapped"
-
-    def init_pygame_joystick(self):
-        pygame.init()
-        pygame.joystick.init()
+        button_name = self._behavior_to_button.get(behavior)
+        if button_name is None:
+            return "Not mapped"
+        return f"Mapped to: {get_friendly_controller_name(button_name)}"
+
+    def show_status(self, message, timeout_ms=3000):
+        """Shows a transient message below the behavior list."""
+        self.status_label.setText(message)
+        self._status_clear_timer.start(timeout_ms)
+
+    def _refresh_mapped_label(self, behavior):
+        """Updates the mapping text of a single behavior row."""
+        label = self._mapped_labels.get(behavior)
+        if label is not None:
+            label.setText(self.get_mapped_button_name(behavior))
+
+    def _cache_joystick_inputs(self, joystick):
+        """Queries the controller's input counts once and precomputes the mapping name of every input."""
+        self._num_axes = joystick.get_numaxes()
+        self._instance_id = joystick.get_instance_id()
+        self._button_names = tuple(f"Button {i}" for i in range(joystick.get_numbuttons()))
+        self._axis_names = tuple((f"Axis {i} Positive", f"Axis {i} Negative") for i in range(self._num_axes))
+        self._hat_names = {(hat, value): f"Hat {hat} {direction}"
+                           for hat in range(joystick.get_numhats()) for value, direction in _HAT_DIRS.items()}
+        self.joystick = joystick
+
+    def init_pygame_joystick(self, quiet=False):
+        # Reuse the controller the video player already opened instead of re-enumerating devices
+        video_player = getattr(self.parent(), 'video_player', None)
+        if video_player is not None and getattr(video_player, 'joystick', None) is not None:
+            try:
+                self._cache_joystick_inputs(video_player.joystick)
+                return
+            except pygame.error:
+                pass # That controller was unplugged; look for another one
+
+        if not pygame_events_available():
+            if not quiet:
+                QMessageBox.information(self, "No Controller", "Controller support is unavailable in this session.")
+            self.joystick = None
+            return
+        pygame.joystick.init() # The event subsystem is already initialized at startup
         if pygame.joystick.get_count() > 0:
             try:
-                self.joystick = pygame.joystick.Joystick(0)
-                self.joystick.init()
+                joystick = pygame.joystick.Joystick(0)
+                joystick.init()
+                self._cache_joystick_inputs(joystick)
             except pygame.error as e:
-                QMessageBox.warning(self, "Controller Error", f"Could not initialize joystick: {e}")
+                if not quiet:
+                    QMessageBox.warning(self, "Controller Error", f"Could not initialize joystick: {e}")
                 self.joystick = None
         else:
-            QMessageBox.information(self, "No Controller", "No game controller detected.")
+            if not quiet:
+                QMessageBox.information(self, "No Controller", "No game controller detected.")
             self.joystick = None
 
     def start_listening(self, behavior):
+        if not self.joystick:
+            self.init_pygame_joystick(quiet=True) # A controller may have been plugged in since the dialog opened
         if not self.joystick:
             QMessageBox.warning(self, "No Controller", "No game controller detected or initialized.")
             return
@@ -2120,113 +2366,134 @@ class ControllerAutomapDialog(QDialog):
         self.list_widget.setEnabled(False) # Disable list while listening
 
         # Record baseline axis values
-        self.baseline_axis_values = {}
-        for i in range(self.joystick.get_numaxes()):
+        baseline_axis_values = []
+        for i in range(self._num_axes):
             try:
-                self.baseline_axis_values[i] = self.joystick.get_axis(i)
+                baseline_axis_values.append(self.joystick.get_axis(i))
             except pygame.error:
-                self.baseline_axis_values[i] = 0.0
+                baseline_axis_values.append(0.0)
+        self.baseline_axis_values = baseline_axis_values
 
         # Start a short delay timer before actually polling for input
-        self.listen_delay_timer = QTimer(self)
-        self.listen_delay_timer.setSingleShot(True)
-        self.listen_delay_timer.timeout.connect(self._start_polling_after_delay)
         self.listen_delay_timer.start(500) # 500ms delay before polling starts
 
     def poll_gamepad_for_mapping(self):
         if not self.listening_for_input or not self.joystick:
+            self.gamepad_timer.stop() # Nothing to listen for; don't keep ticking
             return
 
-        pygame.event.pump() # Process pygame events
-
-        # Check for button presses
-        for i in range(self.joystick.get_numbuttons()):
-            button_state = self.joystick.get_button(i)
-            if button_state:
-                button_name = f"Button {i}"
-                self.map_button_to_behavior(button_name, self.target_behavior)
-                self.stop_listening()
-                return
-
-        # Check for hat presses (D-pad)
-        for i in range(self.joystick.get_numhats()):
-            hat_x, hat_y = self.joystick.get_hat(i)
-            if hat_x != 0 or hat_y != 0:
-                hat_direction = ""
-                if hat_x == 1: hat_direction = "Right"
-                elif hat_x == -1: hat_direction = "Left"
-                elif hat_y == 1: hat_direction = "Up"
-                elif hat_y == -1: hat_direction = "Down"
-                button_name = f"Hat {i} {hat_direction}"
-                self.map_button_to_behavior(button_name, self.target_behavior)
-                self.stop_listening()
-                return
-
-        # Check for axis movement (joysticks/triggers)
-        for i in range(self.joystick.get_numaxes()):
-            axis_value = self.joystick.get_axis(i)
-            baseline_value = self.baseline_axis_values.get(i, 0.0)
-            
-            # Threshold for detecting significant movement
-            activation_threshold = 0.5 
-
-            # Case 1: Axis is a "trigger-like" axis that rests at -1.0 and moves to 1.0
-            # If baseline is near -1.0 -> positive movement
-            if baseline_value < -0.9 and axis_value > activation_threshold:
-                button_name = f"Axis {i} Positive"
-                self.map_button_to_behavior(button_name, self.target_behavior)
-                self.stop_listening()
-                return
-            # Case 2: Axis is a "trigger-like" axis that rests at 1.0 and moves to -1.0 (inverted)
-            # If baseline is near 1.0 -> negative movement
-            elif baseline_value > 0.9 and axis_value < -activation_threshold:
-                button_name = f"Axis {i} Negative"
-                self.map_button_to_behavior(button_name, self.target_behavior)
-                self.stop_listening()
-                return
-            # Case 3: General axis movement (joysticks, or other axes not at extremes)
-            # Detect if the axis value has changed significantly from its baseline
-            elif abs(axis_value - baseline_value) > activation_threshold:
-                axis_direction = "Positive" if axis_value > baseline_value else "Negative"
-                button_name = f"Axis {i} {axis_direction}"
-                self.map_button_to_behavior(button_name, self.target_behavior)
-                self.stop_listening()
+        # Only inspect controller events queued since the last tick instead of scanning every input.
+        # The whole burst is examined so the most deliberate input wins, not whichever arrived first:
+        # a button or hat press beats any axis, and among axes the largest travel from baseline wins.
+        pressed_name = None
+        axis_name = None
+        axis_travel = 0.0
+        # Bind per-event lookups to locals once per tick
+        instance_id = self._instance_id
+        baseline_axis_values = self.baseline_axis_values
+        event_to_button_name = self._event_to_button_name
+        axis_motion = pygame.JOYAXISMOTION
+        for event in pygame.event.get((pygame.JOYBUTTONDOWN, pygame.JOYHATMOTION, axis_motion, pygame.JOYDEVICEREMOVED)):
+            if event.instance_id != instance_id:
+                continue # Input from another controller
+            if event.type == pygame.JOYDEVICEREMOVED:
+                self._on_joystick_removed()
                 return
+            button_name = event_to_button_name(event)
+            if not button_name:
+                continue
+            if event.type != axis_motion:
+                if pressed_name is None:
+                    pressed_name = button_name
+            else:
+                travel = abs(event.value - baseline_axis_values[event.axis])
+                if travel > axis_travel:
+                    axis_name, axis_travel = button_name, travel
+
+        button_name = pressed_name or axis_name
+        if button_name:
+            behavior = self.target_behavior
+            self.stop_listening()
+            self.map_button_to_behavior(button_name, behavior)
+
+    def _on_joystick_removed(self):
+        """Forget the unplugged controller and its cached axis count"""
+        self.stop_listening()
+        self.joystick = None
+        self._num_axes = 0
+        self._instance_id = None
+        self.show_status("The game controller was disconnected.")
+
+    def _event_to_button_name(self, event):
+        """Returns the mapping name for a controller event, or None if it is not a deliberate input."""
+        if event.type == pygame.JOYBUTTONDOWN:
+            return self._button_names[event.button]
+
+        if event.type == pygame.JOYHATMOTION:
+            return self._hat_names.get((event.hat, event.value)) # None when the hat returned to center
+
+        # Axis movement (joysticks/triggers)
+        axis_value = event.value
+        baseline_value = self.baseline_axis_values[event.axis]
+        activation_threshold = self.AXIS_ACTIVATION_THRESHOLD
+        positive_name, negative_name = self._axis_names[event.axis]
+
+        # Case 1: Axis is a "trigger-like" axis that rests at -1.0 and moves to 1.0
+        # If baseline is near -1.0 -> positive movement
+        if baseline_value < -0.9 and axis_value > activation_threshold:
+            return positive_name
+        # Case 2: Axis is a "trigger-like" axis that rests at 1.0 and moves to -1.0 (inverted)
+        # If baseline is near 1.0 -> negative movement
+        elif baseline_value > 0.9 and axis_value < -activation_threshold:
+            return negative_name
+        # Case 3: General axis movement (joysticks, or other axes not at extremes)
+        # Detect if the axis value has changed significantly from its baseline
+        elif abs(axis_value - baseline_value) > activation_threshold:
+            return positive_name if axis_value > baseline_value else negative_name
+        return None
 
     def map_button_to_behavior(self, button_name, behavior):
         # Remove existing mapping for this behavior if it exists
-        for key, value in list(self.current_mappings.items()):
-            if value == behavior:
-                del self.current_mappings[key]
+        old_button = self._behavior_to_button.pop(behavior, None)
+        if old_button is not None:
+            self.current_mappings.pop(old_button, None)
         # Remove existing mapping for this button if it exists
-        if button_name in self.current_mappings:
-            del self.current_mappings[button_name]
+        previous_behavior = self.current_mappings.pop(button_name, None)
+        if previous_behavior is not None:
+            self._behavior_to_button.pop(previous_behavior, None)
 
         self.current_mappings[button_name] = behavior
-        self.populate_behavior_list() # Refresh the list to show new mapping
+        self._behavior_to_button[behavior] = button_name
+        # Refresh only the rows whose mapping changed
+        self._refresh_mapped_label(behavior)
+        if previous_behavior is not None:
+            self._refresh_mapped_label(previous_behavior)
         friendly_name = get_friendly_controller_name(button_name)
-        QMessageBox.information(self, "Mapped", f"'{behavior}' mapped to '{friendly_name}'.")
+        self.show_status(f"'{behavior}' mapped to '{friendly_name}'.")
 
     def clear_mapping(self, behavior):
         """Clears the mapping for a specific behavior."""
-        for button_name, mapped_behavior in list(self.current_mappings.items()):
-            if mapped_behavior == behavior:
-                del self.current_mappings[button_name]
-                break
-        self.populate_behavior_list() # Refresh the list
+        button_name = self._behavior_to_button.pop(behavior, None)
+        if button_name is not None:
+            self.current_mappings.pop(button_name, None)
+        self._refresh_mapped_label(behavior)
 
     def stop_listening(self):
+        if not self.listening_for_input and not self.gamepad_timer.isActive():
+            return # Already idle
         self.listening_for_input = False
         self.target_behavior = None
         self.gamepad_timer.stop()
         self.list_widget.setEnabled(True) # Re-enable list
-        if self.listen_delay_timer and self.listen_delay_timer.isActive():
-            self.listen_delay_timer.stop()
+        self.listen_delay_timer.stop()
+        set_controller_input_events(False) # Nothing drains them until the next listen
 
     def restore_default_mappings(self):
         self.current_mappings = {} # Clear all mappings
-        self.populate_behavior_list()
-        QMessageBox.information(self, "Defaults Restored", "All controller mappings have been cleared.")
+        self._behavior_to_button = {}
+        for behavior in self._mapped_labels:
+            self._refresh_mapped_label(behavior)
+        self.show_status("All controller mappings have been cleared.")
 
     def get_mappings(self):
         return self.current_mappings
@@ -2241,15 +2508,30 @@ class ControllerAutomapDialog(QDialog):
 
     def closeEvent(self, event):
         self.stop_listening()
-        pygame.joystick.quit()
-        pygame.quit()
-        if self.listen_delay_timer and self.listen_delay_timer.isActive():
-            self.listen_delay_timer.stop()
+        # Leave pygame running: the main window keeps polling the same controller
         super().closeEvent(event)
 
     def _start_polling_after_delay(self):
         """Starts the gamepad polling after the initial delay."""
-        self.gamepad_timer.start(50) # Start polling
+        # Queue controller input only while this dialog drains it, then drop anything stale
+        set_controller_input_events(True)
+        pygame.event.clear(CONTROLLER_INPUT_EVENTS)
+        self.gamepad_timer.start(self.POLL_INTERVAL_MS) # Only runs while listening; idle ticks do no SDL queries
+
+
+def render_widget_to_pixmap(widget, render):
+    """Render a widget's contents once into a pixmap at device resolution"""
+    # Rasterize at the screen's pixel ratio so the cached chart stays sharp on HiDPI displays
+    ratio = widget.devicePixelRatioF()
+    pixmap = QPixmap(widget.size() * ratio)
+    pixmap.setDevicePixelRatio(ratio)
+    # Opaque charts paint their own background, so bake the window color into the cache
+    pixmap.fill(widget.palette().color(widget.backgroundRole()))
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    render(painter)
+    painter.end()
+    return pixmap
 
 
 class BehaviorChart(QWidget):
@@ -2257,91 +2539,164 @@ class BehaviorChart(QWidget):
 
     def __init__(self, behavior_data, behavior_colors, parent=None):
         super().__init__(parent)
-        self.behavior_data = behavior_data
         self.behavior_colors = behavior_colors
         self.setMinimumHeight(200)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        # Chart margins: left, right, top, bottom
+        self.margins = (60, 20, 60, 40)
+
+        # Fonts are reused across paints
+        self._title_font = QFont()
+        self._title_font.setBold(True)
+        self._label_font = QFont()
+        self._label_font.setPointSize(8)
+        self._axis_font = QFont()
+        self._text_pen = QPen(Qt.black)
+        self._axis_pen = QPen(Qt.black, 2)
+
+        self._bar_groups = [] # (brush, pen, [bar rects]) so bars sharing a color are drawn in one call
+        self._bar_styles = {} # RGBA -> (brush, darker outline pen), kept across layout rebuilds
+        self._default_bar_color = QColor(100, 100, 100)
+        self._bar_labels = [] # (name_transform, name_text, frames_pos, frames_static_text)
+        self._static_texts = {} # (text, font key) -> laid out QStaticText
+        self._cache_pixmap = None # Rendered chart, reused until the size or data changes
+        # paintEvent covers every pixel, so skip Qt's background fill
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+        self.setAutoFillBackground(False)
+        self.set_behavior_data(behavior_data)
+
+    def set_behavior_data(self, behavior_data):
+        """Set the per-behavior statistics and rebuild the bar layout"""
+        self.behavior_data = behavior_data
+        # Find max frames for scaling
+        self._max_frames = max(stats['total_frames'] for stats in behavior_data.values()) if behavior_data else 1
+        # Y-axis ticks as (fraction of the chart height, label); only depends on the data
+        max_frames = self._max_frames
+        self._y_ticks = [(i / max_frames if max_frames > 0 else 0.0, self._static_text(str(i), self._axis_font))
+                         for i in range(0, max_frames + 1, max(1, max_frames // 5))]
+        self._rebuild_layout()
+        self._cache_pixmap = None
+        self.update()
+
+    def _static_text(self, text, font):
+        """Return a cached QStaticText for text, laid out once for font"""
+        key = (text, font.key())
+        static_text = self._static_texts.get(key)
+        if static_text is None:
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(QTransform(), font)
+            self._static_texts[key] = static_text
+        return static_text
+
+    def _rebuild_layout(self):
+        """Precompute bar geometry for the current widget size"""
+        self._bar_groups = []
+        self._bar_labels = []
+        if not self.behavior_data:
+            return
 
-        # Get dimensions
-        width = self.width()
+        margin_left, margin_right, margin_top, margin_bottom = self.margins
         height = self.height()
+        chart_width = self.width() - margin_left - margin_right
+        chart_height = height - margin_top - margin_bottom
+        max_frames = self._max_frames
+
+        num_bars = len(self.behavior_data)
+        bar_width = chart_width / num_bars
+        # Bar positions and heights for all behaviors at once
+        frame_counts = np.fromiter((stats['total_frames'] for stats in self.behavior_data.values()),
+                                   dtype=np.int64, count=num_bars)
+        bar_xs = margin_left + np.arange(num_bars) * bar_width
+        if max_frames > 0:
+            bar_heights = frame_counts / max_frames * chart_height
+        else:
+            bar_heights = np.zeros(num_bars)
+        bar_ys = height - margin_bottom - bar_heights
 
+        groups = {}
+        for behavior, frames, x, bar_y, bar_height in zip(self.behavior_data, frame_counts.tolist(), bar_xs.tolist(),
+                                                          bar_ys.tolist(), bar_heights.tolist()):
+            # Get color for behavior
+            color = self.behavior_colors.get(behavior, self._default_bar_color)
+            # QColor isn't hashable, so bars are grouped by their RGBA value
+            rgba = color.rgba()
+            group = groups.get(rgba)
+            if group is None:
+                style = self._bar_styles.get(rgba)
+                if style is None:
+                    style = self._bar_styles[rgba] = (QBrush(color), QPen(color.darker(), 1))
+                group = groups[rgba] = style + ([],)
+            group[2].append(QRect(int(x), int(bar_y), int(bar_width - 5), int(bar_height)))
+
+            # Behavior name is drawn rotated below the bar, frame count above it
+            name_transform = QTransform().translate(x + bar_width/2, height - margin_bottom + 15).rotate(-45)
+            frames_text = self._static_text(str(frames), self._label_font)
+            frames_size = frames_text.size()
+            # Centered in the 20px high strip starting just above the bar
+            frames_pos = QPointF(x + (bar_width - frames_size.width()) / 2, bar_y - 5 + (20 - frames_size.height()) / 2)
+            self._bar_labels.append((name_transform, behavior[:10], frames_pos, frames_text))  # Truncate long names
+        self._bar_groups = list(groups.values())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._rebuild_layout()
+        self._cache_pixmap = None
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
         if not self.behavior_data:
+            painter.fillRect(self.rect(), self.palette().color(self.backgroundRole()))
             return
+        # Statistics don't change while the dialog is open, so render once per size
+        if self._cache_pixmap is None:
+            self._cache_pixmap = render_widget_to_pixmap(self, self._render)
+        painter.drawPixmap(0, 0, self._cache_pixmap)
 
-        # Find max frames for scaling
-        max_frames = max(stats['total_frames'] for stats in self.behavior_data.values()) if self.behavior_data else 1
-
-        # Chart margins
-        margin_left = 60
-        margin_right = 20
-        margin_top = 60
-        margin_bottom = 40
+    def _render(self, painter):
+        """Draw the full chart with the given painter"""
+        # Get dimensions
+        width = self.width()
+        height = self.height()
 
-        chart_width = width - margin_left - margin_right
+        margin_left, margin_right, margin_top, margin_bottom = self.margins
         chart_height = height - margin_top - margin_bottom
 
         # Draw title
-        title_font = QFont()
-        title_font.setBold(True)
-        painter.setFont(title_font)
+        painter.setFont(self._title_font)
         painter.drawText(0, 15, width, 20, Qt.AlignCenter, "Behavior Frame Counts")
 
-        # Draw bars
-        bar_width = chart_width / len(self.behavior_data) if self.behavior_data else 0
-        x = margin_left
+        # Draw bars, one call per color
+        for brush, pen, rects in self._bar_groups:
+            painter.setBrush(brush)
+            painter.setPen(pen)
+            painter.drawRects(rects)
 
-        for behavior, stats in self.behavior_data.items():
-            frames = stats['total_frames']
-            if max_frames > 0:
-                bar_height = (frames / max_frames) * chart_height
-            else:
-                bar_height = 0
+        # Draw labels
+        painter.setFont(self._label_font)
+        painter.setPen(self._text_pen)
+        for name_transform, name_text, frames_pos, frames_text in self._bar_labels:
+            # Rotated behavior name
+            painter.setTransform(name_transform)
+            painter.drawText(-30, 0, 60, 20, Qt.AlignCenter, name_text)
+            painter.resetTransform()
 
-            # Get color for behavior
-            color = self.behavior_colors.get(behavior, QColor(100, 100, 100))
-            painter.setBrush(QBrush(color))
-            painter.setPen(QPen(color.darker(), 1))
-
-            # Draw bar
-            bar_x = x
-            bar_y = height - margin_bottom - bar_height
-            painter.drawRect(int(bar_x), int(bar_y), int(bar_width - 5), int(bar_height))
-
-            # Draw label
-            label_font = QFont()
-            label_font.setPointSize(8)
-            painter.setFont(label_font)
-            painter.setPen(QPen(Qt.black))
-
-            # Rotate and draw behavior name
-            painter.save()
-            painter.translate(bar_x + bar_width/2, height - margin_bottom + 15)
-            painter.rotate(-45)
-            painter.drawText(-30, 0, 60, 20, Qt.AlignCenter, behavior[:10])  # Truncate long names
-            painter.restore()
-
-            # Draw frame count above bar
-            painter.setPen(QPen(Qt.black))
-            painter.drawText(int(bar_x), int(bar_y - 5), int(bar_width), 20, Qt.AlignCenter, str(frames))
-
-            x += bar_width
+            # Frame count above bar
+            painter.drawStaticText(frames_pos, frames_text)
 
         # Draw axes
-        painter.setPen(QPen(Qt.black, 2))
-        # Y-axis
-        painter.drawLine(margin_left, margin_top, margin_left, height - margin_bottom)
-        # X-axis
-        painter.drawLine(margin_left, height - margin_bottom, width - margin_right, height - margin_bottom)
+        painter.setPen(self._axis_pen)
+        painter.drawLines([
+            QLineF(margin_left, margin_top, margin_left, height - margin_bottom),  # Y-axis
+            QLineF(margin_left, height - margin_bottom, width - margin_right, height - margin_bottom)  # X-axis
+        ])
 
         # Draw Y-axis labels
-        painter.setFont(QFont())
-        for i in range(0, max_frames + 1, max(1, max_frames // 5)):
-            y_pos = height - margin_bottom - (i / max_frames) * chart_height if max_frames > 0 else height - margin_bottom
-            painter.drawText(5, int(y_pos - 5), margin_left - 10, 20, Qt.AlignRight, str(i))
+        painter.setFont(self._axis_font)
+        for tick_fraction, tick_text in self._y_ticks:
+            y_pos = height - margin_bottom - tick_fraction * chart_height
+            # Right-aligned against the Y-axis
+            painter.drawStaticText(QPointF(margin_left - 5 - tick_text.size().width(), int(y_pos - 5)), tick_text)
 
 
 class PieChart(QWidget):
@@ -2352,53 +2707,82 @@ class PieChart(QWidget):
         self.labeling_stats = labeling_stats
         self.setMinimumHeight(250)
         self.setMinimumWidth(250)
+        self._cache_pixmap = None # Rendered chart, reused until the size changes
+        # paintEvent covers every pixel, so skip Qt's background fill
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+        self.setAutoFillBackground(False)
+
+        # Pie spans in 16ths of a degree (5760 per full circle); unlabeled takes the rest so there is no gap
+        self._labeled_angle = 0
+        self._unlabeled_angle = 0
+        if labeling_stats and labeling_stats['total_frames'] > 0:
+            self._labeled_angle = int(labeling_stats['labeled_percentage'] * 57.6)
+            if labeling_stats['unlabeled_percentage'] > 0:
+                self._unlabeled_angle = 5760 - self._labeled_angle
+            # Legend text is fixed for the lifetime of the chart
+            self._labeled_text = f"Labeled: {labeling_stats['labeled_percentage']:.1f}%"
+            self._unlabeled_text = f"Unlabeled: {labeling_stats['unlabeled_percentage']:.1f}%"
+
+        # Colors, pens and fonts are created once instead of on every render
+        labeled_color = QColor(100, 200, 100)  # Green for labeled
+        unlabeled_color = QColor(200, 100, 100)  # Red for unlabeled
+        self._labeled_brush = QBrush(labeled_color)
+        self._labeled_pen = QPen(labeled_color.darker(), 2)
+        self._unlabeled_brush = QBrush(unlabeled_color)
+        self._unlabeled_pen = QPen(unlabeled_color.darker(), 2)
+        self._legend_box_pen = QPen(Qt.black, 1)
+        self._text_pen = QPen(Qt.black)
+        self._title_font = QFont()
+        self._title_font.setBold(True)
+        self._legend_font = QFont()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._cache_pixmap = None
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        if not self.labeling_stats or self.labeling_stats['total_frames'] == 0:
+            painter.fillRect(self.rect(), self.palette().color(self.backgroundRole()))
+            return
+        # Statistics don't change while the dialog is open, so render once per size
+        if self._cache_pixmap is None:
+            self._cache_pixmap = render_widget_to_pixmap(self, self._render)
+        painter.drawPixmap(0, 0, self._cache_pixmap)
 
+    def _render(self, painter):
+        """Draw the pie, title and legend with the given painter"""
         # Get dimensions
         width = self.width()
         height = self.height()
 
-        if not self.labeling_stats or self.labeling_stats['total_frames'] == 0:
-            return
-
         # Chart dimensions
         center_x = width // 2
         center_y = height // 2
         radius = min(width, height) // 2 - 40
 
         # Data
-        labeled_percentage = self.labeling_stats['labeled_percentage']
-        unlabeled_percentage = self.labeling_stats['unlabeled_percentage']
-
-        # Colors
-        labeled_color = QColor(100, 200, 100)  # Green for labeled
-        unlabeled_color = QColor(200, 100, 100)  # Red for unlabeled
+        labeled_angle = self._labeled_angle
+        unlabeled_angle = self._unlabeled_angle
 
         # Draw title
-        title_font = QFont()
-        title_font.setBold(True)
-        painter.setFont(title_font)
+        painter.setFont(self._title_font)
         painter.drawText(0, 15, width, 20, Qt.AlignCenter, "Frame Labeling Overview")
 
         # Draw pie chart
         start_angle = 0
 
         # Labeled portion
-        if labeled_percentage > 0:
-            labeled_angle = int(labeled_percentage * 16 * 3.6)  # Convert to 16ths of degree
-            painter.setBrush(QBrush(labeled_color))
-            painter.setPen(QPen(labeled_color.darker(), 2))
+        if labeled_angle > 0:
+            painter.setBrush(self._labeled_brush)
+            painter.setPen(self._labeled_pen)
             painter.drawPie(center_x - radius, center_y - radius, radius * 2, radius * 2, start_angle, labeled_angle)
             start_angle += labeled_angle
 
         # Unlabeled portion
-        if unlabeled_percentage > 0:
-            unlabeled_angle = int(unlabeled_percentage * 16 * 3.6)  # Convert to 16ths of degree
-            painter.setBrush(QBrush(unlabeled_color))
-            painter.setPen(QPen(unlabeled_color.darker(), 2))
+        if unlabeled_angle > 0:
+            painter.setBrush(self._unlabeled_brush)
+            painter.setPen(self._unlabeled_pen)
             painter.drawPie(center_x - radius, center_y - radius, radius * 2, radius * 2, start_angle, unlabeled_angle)
 
         # Draw legend
@@ -2406,19 +2790,36 @@ class PieChart(QWidget):
         legend_y = height - 60
 
         # Labeled legend
-        painter.setBrush(QBrush(labeled_color))
-        painter.setPen(QPen(Qt.black, 1))
+        painter.setBrush(self._labeled_brush)
+        painter.setPen(self._legend_box_pen)
         painter.drawRect(legend_x, legend_y, 15, 15)
-        painter.setPen(QPen(Qt.black))
-        painter.setFont(QFont())
-        painter.drawText(legend_x + 20, legend_y + 12, f"Labeled: {labeled_percentage:.1f}%")
+        painter.setPen(self._text_pen)
+        painter.setFont(self._legend_font)
+        painter.drawText(legend_x + 20, legend_y + 12, self._labeled_text)
 
         # Unlabeled legend
-        painter.setBrush(QBrush(unlabeled_color))
-        painter.setPen(QPen(Qt.black, 1))
+        painter.setBrush(self._unlabeled_brush)
+        painter.setPen(self._legend_box_pen)
         painter.drawRect(legend_x, legend_y + 20, 15, 15)
-        painter.setPen(QPen(Qt.black))
-        painter.drawText(legend_x + 20, legend_y + 32, f"Unlabeled: {unlabeled_percentage:.1f}%")
+        painter.setPen(self._text_pen)
+        painter.drawText(legend_x + 20, legend_y + 32, self._unlabeled_text)
+
+
+class LazyChart(QWidget):
+    """Placeholder that creates its chart the first time it is scrolled into view"""
+
+    def __init__(self, create_chart, min_width, min_height, parent=None):
+        super().__init__(parent)
+        self._create_chart = create_chart
+        self.setMinimumSize(min_width, min_height) # Reserve the chart's space up front
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    def paintEvent(self, event):
+        # Only painted once it is visible in the scroll area; build the chart outside of the paint
+        if self._create_chart is not None:
+            create_chart, self._create_chart = self._create_chart, None
+            QTimer.singleShot(0, self, lambda: self._layout.addWidget(create_chart()))
 
 
 class StatisticsDialog(QDialog):
@@ -2429,22 +2830,16 @@ class StatisticsDialog(QDialog):
         self.setWindowTitle("Annotation Statistics")
         self.setModal(True)
         self.statistics = statistics
-        # Get behavior colors from parent and convert to QColor
+        # Get behavior colors from parent as QColor
         self.behavior_colors = {}
         if parent and hasattr(parent, 'behavior_buttons'):
-            for behavior in parent.behavior_buttons.behaviors:
-                color_str = parent.behavior_buttons.get_behavior_color(behavior)
-                if isinstance(color_str, str):
-                    # Convert hex string to QColor
-                    if color_str.startswith('#'):
-                        self.behavior_colors[behavior] = QColor(color_str)
-                    else:
-                        self.behavior_colors[behavior] = QColor(100, 100, 100)  # Default gray
-                else:
-                    self.behavior_colors[behavior] = color_str
+            get_qcolor = parent.behavior_buttons.get_behavior_qcolor
+            self.behavior_colors = {behavior: get_qcolor(behavior) for behavior in parent.behavior_buttons.behaviors}
         self.setup_ui()
 
     def setup_ui(self):
+        # Batch all widget additions into a single layout pass and repaint
+        self.setUpdatesEnabled(False)
         layout = QVBoxLayout(self)
 
         # Title
@@ -2457,7 +2852,7 @@ class StatisticsDialog(QDialog):
         if 'labeling_stats' in self.statistics and self.statistics['labeling_stats']['total_frames'] > 0:
             pie_group = QGroupBox("Labeling Overview")
             pie_layout = QVBoxLayout(pie_group)
-            pie_chart = PieChart(self.statistics['labeling_stats'])
+            pie_chart = LazyChart(lambda: PieChart(self.statistics['labeling_stats']), 250, 250)
             pie_layout.addWidget(pie_chart)
             scroll_layout.addWidget(pie_group)
 
@@ -2465,7 +2860,7 @@ class StatisticsDialog(QDialog):
         if 'behaviors' in self.statistics and self.statistics['behaviors']:
             chart_group = QGroupBox("Behavior Frame Distribution")
             chart_layout = QVBoxLayout(chart_group)
-            chart = BehaviorChart(self.statistics['behaviors'], self.behavior_colors)
+            chart = LazyChart(lambda: BehaviorChart(self.statistics['behaviors'], self.behavior_colors), 0, 200)
             chart_layout.addWidget(chart)
             scroll_layout.addWidget(chart_group)
 
@@ -2474,9 +2869,12 @@ class StatisticsDialog(QDialog):
             behavior_group = QGroupBox("Behavior Statistics")
             behavior_layout = QVBoxLayout(behavior_group)
 
-            for behavior, stats in self.statistics['behaviors'].items():
-                behavior_label = QLabel(f"{behavior}: {stats['block_count']} blocks, max duration: {stats['max_duration']:.2f}s")
-                behavior_layout.addWidget(behavior_label)
+            # One label for all behaviors instead of a widget per behavior
+            behavior_label = QLabel("\n".join(
+                f"{behavior}: {stats['block_count']} blocks, max duration: {stats['max_duration']:.2f}s"
+                for behavior, stats in self.statistics['behaviors'].items()))
+            behavior_label.setTextFormat(Qt.PlainText) # Behavior names are never interpreted as rich text
+            behavior_layout.addWidget(behavior_label)
 
             scroll_layout.addWidget(behavior_group)
 
@@ -2507,6 +2905,7 @@ class StatisticsDialog(QDialog):
         buttons.accepted.connect(self.accept)
         layout.addWidget(buttons)
 
+        self.setUpdatesEnabled(True)
         self.setMinimumWidth(600)
         self.setMinimumHeight(500)
 